@@ -0,0 +1,71 @@
+"""
+`Bolt11.to_bytes()` against JSON and pickle, serialized size and the time
+to load a decoded invoice back, from the binary format, pickle, or by
+decoding the payment request again. JSON can not be loaded into a `Bolt11`.
+"""
+
+import json
+import pickle
+
+from common import bench, make_payment_requests, report
+
+from bolt11 import Bolt11, RouteHint, Tag, TagChar, decode
+
+COUNT = 2000
+
+
+def main() -> None:
+    route_hint = RouteHint.from_list(
+        [
+            {
+                "public_key": "02" + "11" * 32,
+                "short_channel_id": "700000x1x0",
+                "base_fee": 1000,
+                "ppm_fee": 1,
+                "cltv_expiry_delta": 40,
+            }
+        ]
+    )
+    prs = make_payment_requests(COUNT, [Tag(TagChar.route_hint, route_hint)])
+    invoices = [decode(pr) for pr in prs]
+    binary = [invoice.to_bytes() for invoice in invoices]
+    pickled = [pickle.dumps(invoice) for invoice in invoices]
+
+    print("average size in bytes")
+    print(f"  {'payment request':<46} {sum(map(len, prs)) / COUNT:8.0f}")
+    print(f"  {'to_bytes':<46} {sum(map(len, binary)) / COUNT:8.0f}")
+    sizes = [len(invoice.json) for invoice in invoices]
+    print(f"  {'json':<46} {sum(sizes) / COUNT:8.0f}")
+    print(f"  {'pickle':<46} {sum(map(len, pickled)) / COUNT:8.0f}")
+    print()
+
+    dumps = {}
+    dumps["json.dumps(data)"] = bench(
+        "json.dumps(data)",
+        lambda: [json.dumps(invoice._build_data()) for invoice in invoices],
+        COUNT,
+    )
+    dumps["pickle.dumps"] = bench(
+        "pickle.dumps", lambda: [pickle.dumps(invoice) for invoice in invoices], COUNT
+    )
+    dumps["to_bytes"] = bench(
+        "to_bytes", lambda: [invoice.to_bytes() for invoice in invoices], COUNT
+    )
+    loads = {}
+    loads["decode, not verified"] = bench(
+        "decode, not verified",
+        lambda: [decode(pr, verify=False) for pr in prs],
+        COUNT,
+    )
+    loads["pickle.loads"] = bench(
+        "pickle.loads", lambda: [pickle.loads(data) for data in pickled], COUNT
+    )
+    loads["from_bytes"] = bench(
+        "from_bytes", lambda: [Bolt11.from_bytes(data) for data in binary], COUNT
+    )
+    report(f"serializing {COUNT} invoices", dumps)
+    report(f"loading {COUNT} invoices", loads)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+`bolt11 decode` once per invoice, paying interpreter and import startup each
+time, against a single `bolt11 decode-batch` over stdin.
+"""
+
+import subprocess
+import sys
+
+from common import bench, make_payment_requests, report
+
+COUNT = 2000
+SINGLE_COUNT = 50
+
+
+def cli(*args: str, input: str = "") -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "-m", "bolt11.cli", *args],
+        input=input,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def main() -> None:
+    prs = make_payment_requests(COUNT)
+    stdin = "\n".join(prs)
+    results = {}
+    results["decode per process"] = bench(
+        "decode per process",
+        lambda: [cli("decode", pr) for pr in prs[:SINGLE_COUNT]],
+        SINGLE_COUNT,
+        repeat=1,
+    )
+    for workers in ("1", "2", "4"):
+        name = f"decode-batch, {workers} workers"
+        results[name] = bench(
+            name,
+            lambda: cli("decode-batch", "--workers", workers, input=stdin),
+            COUNT,
+        )
+    report(f"{COUNT} payment requests through the CLI", results)
+
+
+if __name__ == "__main__":
+    main()
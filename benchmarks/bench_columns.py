@@ -0,0 +1,54 @@
+"""
+Columnar export for analytics, `decode_to_columns` against `decode_bulk`
+followed by reading the same fields off the invoices. Neither verifies
+signatures, the payee is taken from the `n` field.
+Needs the numpy extra: uv run --extra numpy python benchmarks/bench_columns.py
+"""
+
+import numpy as np
+from coincurve import PrivateKey
+from common import PRIVATE_KEY, bench, make_invoice, report
+
+from bolt11 import Bolt11, Tag, TagChar, encode
+from bolt11.vectorized import decode_bulk, decode_to_columns
+
+COUNT = 5_000
+
+
+def columns_from_invoices(prs: list) -> dict:
+    invoices = [i for i in decode_bulk(prs, verify=False) if isinstance(i, Bolt11)]
+    payees = [i.tags.get(TagChar.payee) for i in invoices]
+    return {
+        "amount_msat": np.array([i.amount_msat or 0 for i in invoices]),
+        "date": np.array([i.date for i in invoices]),
+        "expiry": np.array([i.expiry for i in invoices]),
+        "min_final_cltv_expiry": np.array([i.min_final_cltv_expiry for i in invoices]),
+        "payee": np.frombuffer(
+            b"".join(tag.raw if tag else bytes(33) for tag in payees),
+            dtype=np.uint8,
+        ),
+        "payment_hash": np.frombuffer(
+            b"".join(i.payment_hash_bytes for i in invoices), dtype=np.uint8
+        ),
+    }
+
+
+def main() -> None:
+    payee = PrivateKey.from_hex(PRIVATE_KEY).public_key.format()
+    tags = [Tag(TagChar.payee, payee)]
+    prs = [
+        encode(make_invoice(i, tags), PRIVATE_KEY, keep_payee=True)
+        for i in range(COUNT)
+    ]
+    results = {}
+    results["decode_bulk, then columns"] = bench(
+        "decode_bulk, then columns", lambda: columns_from_invoices(prs), COUNT
+    )
+    results["decode_to_columns"] = bench(
+        "decode_to_columns", lambda: decode_to_columns(prs, verify=False), COUNT
+    )
+    report(f"{COUNT} payment requests to columns", results)
+
+
+if __name__ == "__main__":
+    main()
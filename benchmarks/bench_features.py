@@ -0,0 +1,61 @@
+"""
+Features parsing on adversarial invoices, a features field of the maximum
+1023 groups with every bit set, against the previous bit by bit parser.
+"""
+
+from bitstring import Bits
+from common import PRIVATE_KEY, bench, make_invoice, report
+
+from bolt11 import Feature, FeatureExtra, Features, FeatureState, decode, encode
+from bolt11.models.tags import Tag, TagChar
+
+MAX_BITS = 1023 * 5
+COUNT = 20
+
+
+def legacy_from_bitstring(data: Bits) -> dict:
+    """Previous `Features.from_bitstring`, one `Bits` slice per bit."""
+    while data.len % 5 != 0:
+        data = data + "0b0"
+    feature_list: dict = {}
+    for i in range(0, data.length):
+        feature_index = i // 2
+        si = i + 1
+        cut = data[-si : -si + 1] if i > 0 else data[-si:]
+        if cut == "0b1":
+            feature = (
+                Feature(feature_index)
+                if feature_index < len(Feature)
+                else FeatureExtra(feature_index)
+            )
+            feature_list[feature] = (
+                FeatureState.supported if i % 2 else FeatureState.required
+            )
+    return feature_list
+
+
+def main() -> None:
+    data = Bits(uint=(1 << MAX_BITS) - 1, length=MAX_BITS)
+    features = Features.from_bitstring(data)
+    pr = encode(make_invoice(0, [Tag(TagChar.features, features)]), PRIVATE_KEY)
+    print(f"{len(pr)} character payment request, {MAX_BITS} feature bits")
+
+    results = {}
+    results["legacy from_bitstring"] = bench(
+        "legacy from_bitstring",
+        lambda: [legacy_from_bitstring(data) for _ in range(COUNT)],
+        COUNT,
+    )
+    results["from_bitstring"] = bench(
+        "from_bitstring",
+        lambda: [Features.from_bitstring(data) for _ in range(COUNT)],
+        COUNT,
+    )
+    results["decode"] = bench(
+        "decode", lambda: [decode(pr, verify=False) for _ in range(COUNT)], COUNT
+    )
+    report("maximal features field", results)
+
+
+if __name__ == "__main__":
+    main()
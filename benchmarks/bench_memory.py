@@ -0,0 +1,41 @@
+"""
+Memory held per decoded invoice, measured with tracemalloc while keeping
+a list of decoded invoices alive, lazy and eager.
+"""
+
+import gc
+import tracemalloc
+
+from common import make_payment_requests
+
+from bolt11 import decode
+from bolt11.models.signature import recovery_cache
+
+COUNT = 5_000
+
+
+def bytes_per_invoice(prs: list, **kwargs) -> float:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    invoices = [decode(pr, **kwargs) for pr in prs]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del invoices
+    return size / len(prs)
+
+
+def main() -> None:
+    prs = make_payment_requests(COUNT)
+    # the recovery cache holds public keys across decodes, keep it out
+    recovery_cache.resize(0)
+    for name, kwargs in {
+        "decode": {},
+        "decode(lazy=True, verify=False)": {"lazy": True, "verify": False},
+    }.items():
+        print(f"{name:<48} {bytes_per_invoice(prs, **kwargs):10.0f} bytes/invoice")
+
+
+if __name__ == "__main__":
+    main()
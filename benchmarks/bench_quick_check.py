@@ -0,0 +1,80 @@
+"""
+Rejection throughput on an invalid-heavy corpus: `quick_check`, `decode`
+with its pre-filter, and the previous rejection path of a full
+`bech32_decode` plus `verify_hrp`.
+"""
+
+import random
+import string
+
+from common import bench, make_payment_requests, report
+
+from bolt11 import Bolt11Exception, decode, quick_check
+from bolt11.bech32 import bech32_decode
+from bolt11.utils import verify_hrp
+
+COUNT = 20_000
+
+
+def make_corpus(count: int) -> list:
+    """10% valid invoices, the rest garbage, truncated or foreign strings."""
+    rng = random.Random(0)
+    valid = make_payment_requests(20)
+    garbage = [
+        lambda: "".join(rng.choices(string.printable, k=rng.randint(1, 400))),
+        lambda: rng.choice(valid)[: rng.randint(1, 120)],
+        lambda: "bc1qw508d6qejxtdg4y5r3zarvary0c5xw7kv8f3t4",
+        lambda: "https://example.com/pay?invoice=" + rng.choice(valid),
+        lambda: "lnurl1dp68gurn8ghj7um9wfmxjcm99e3k7mf0v9cxj0m385ekvcenxc6r2c35",
+        lambda: rng.choice(valid).replace("q", "b", 1),
+    ]
+    return [
+        rng.choice(valid) if rng.random() < 0.1 else rng.choice(garbage)()
+        for _ in range(count)
+    ]
+
+
+def old_reject(pr: str) -> bool:
+    hrp, data = bech32_decode(pr.lower())
+    if hrp is None or data is None:
+        return False
+    try:
+        verify_hrp(hrp)
+    except Bolt11Exception:
+        return False
+    return True
+
+
+def decode_all(corpus: list) -> None:
+    for pr in corpus:
+        try:
+            decode(pr, verify=False)
+        except Exception:
+            pass
+
+
+def main() -> None:
+    corpus = make_corpus(COUNT)
+    invalid = [pr for pr in corpus if not old_reject(pr)]
+    print(f"{len(corpus)} strings, {len(invalid)} invalid")
+
+    results = {}
+    results["bech32_decode + verify_hrp"] = bench(
+        "bech32_decode + verify_hrp",
+        lambda: [old_reject(pr) for pr in invalid],
+        len(invalid),
+    )
+    results["quick_check"] = bench(
+        "quick_check", lambda: [quick_check(pr) for pr in invalid], len(invalid)
+    )
+    results["decode (pre-filtered)"] = bench(
+        "decode (pre-filtered)", lambda: decode_all(invalid), len(invalid)
+    )
+    report("rejection throughput", results)
+
+    rejected = sum(not quick_check(pr) for pr in invalid)
+    print(f"\nquick_check rejects {rejected} of {len(invalid)} invalid strings")
+
+
+if __name__ == "__main__":
+    main()
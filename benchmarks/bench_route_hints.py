@@ -0,0 +1,109 @@
+"""
+Route hint parsing and encoding on invoices from large LSPs, many hints of
+a few hops each, against the previous `ConstBitStream` reads per hop.
+"""
+
+from typing import Sequence
+
+from bitstring import BitArray, Bits, ConstBitStream, pack
+from common import PRIVATE_KEY, bench, make_invoice, report
+
+from bolt11 import Route, RouteHint, decode, encode
+from bolt11.bit_utils import int_to_scid, scid_to_int
+from bolt11.models.tags import Tag, TagChar
+
+HINTS = 20
+HOPS = 3
+COUNT = 200
+
+
+def legacy_from_bitstring(data: Bits) -> list:
+    """Previous `RouteHint.from_bitstring`."""
+    stream = ConstBitStream(data)
+    routes = []
+    while stream.pos + 264 + 64 + 32 + 32 + 16 < stream.len:
+        routes.append(
+            Route(
+                public_key=stream.read(264).tobytes().hex(),
+                short_channel_id=int_to_scid(stream.read(64).intbe),
+                base_fee=stream.read(32).intbe,
+                ppm_fee=stream.read(32).intbe,
+                cltv_expiry_delta=stream.read(16).intbe,
+            )
+        )
+    return routes
+
+
+def legacy_data(routes: Sequence) -> Bits:
+    """Previous `RouteHint.data`."""
+    route_hints = BitArray()
+    for route in routes:
+        route_hints.append(
+            BitArray(hex=route.public_key)
+            + pack("uintbe:64", scid_to_int(route.short_channel_id))
+            + pack("uintbe:32", route.base_fee)
+            + pack("uintbe:32", route.ppm_fee)
+            + pack("uintbe:16", route.cltv_expiry_delta)
+        )
+    return route_hints
+
+
+def make_route_hint(index: int) -> RouteHint:
+    return RouteHint(
+        [
+            Route(
+                public_key="02" + f"{index:02x}{hop:02x}" * 16,
+                short_channel_id=f"{800_000 + index}x{hop}x{index}",
+                base_fee=1000,
+                ppm_fee=100,
+                cltv_expiry_delta=144,
+            )
+            for hop in range(HOPS)
+        ]
+    )
+
+
+def main() -> None:
+    hints = [make_route_hint(i) for i in range(HINTS)]
+    pr = encode(
+        make_invoice(0, [Tag(TagChar.route_hint, hint) for hint in hints]),
+        PRIVATE_KEY,
+    )
+    print(f"{len(pr)} character payment request, {HINTS} hints of {HOPS} hops")
+    bits = [hint.data for hint in hints]
+    routes = [hint.routes for hint in hints]
+    items = COUNT * HINTS
+
+    parsing = {}
+    parsing["legacy from_bitstring"] = bench(
+        "legacy from_bitstring",
+        lambda: [legacy_from_bitstring(b) for _ in range(COUNT) for b in bits],
+        items,
+    )
+    parsing["from_bitstring + routes"] = bench(
+        "from_bitstring + routes",
+        lambda: [
+            RouteHint.from_bitstring(b).routes for _ in range(COUNT) for b in bits
+        ],
+        items,
+    )
+    report("parsing", parsing)
+
+    encoding = {}
+    encoding["legacy data"] = bench(
+        "legacy data",
+        lambda: [legacy_data(r) for _ in range(COUNT) for r in routes],
+        items,
+    )
+    encoding["RouteHint(routes).data"] = bench(
+        "RouteHint(routes).data",
+        lambda: [RouteHint(r).data for _ in range(COUNT) for r in routes],
+        items,
+    )
+    report("encoding", encoding)
+
+    bench("decode", lambda: [decode(pr, verify=False) for _ in range(COUNT)], COUNT)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+`Bolt11.data` and `Bolt11.json` of decoded invoices, built on every access
+against the cached result, and the standard library against orjson.
+"""
+
+from common import bench, make_payment_requests, report
+
+from bolt11 import decode, set_json_backend
+
+COUNT = 2000
+
+
+def invalidate(invoices: list) -> None:
+    """Any field assignment drops the cached data and json."""
+    for invoice in invoices:
+        invoice.date = invoice.date
+
+
+def main() -> None:
+    invoices = [decode(pr) for pr in make_payment_requests(COUNT)]
+
+    results = {}
+    results["data, built"] = bench(
+        "data, built", lambda: [invoice._build_data() for invoice in invoices], COUNT
+    )
+    results["data, cached"] = bench(
+        "data, cached", lambda: [invoice.data for invoice in invoices], COUNT
+    )
+    results["json, built"] = bench(
+        "json, built",
+        lambda _: [invoice.json for invoice in invoices],
+        COUNT,
+        setup=lambda: invalidate(invoices),
+    )
+    results["json, cached"] = bench(
+        "json, cached", lambda: [invoice.json for invoice in invoices], COUNT
+    )
+    try:
+        set_json_backend("orjson")
+    except ImportError:
+        print("orjson not installed, skipping")
+    else:
+        results["orjson, built"] = bench(
+            "orjson, built",
+            lambda _: [invoice.json for invoice in invoices],
+            COUNT,
+            setup=lambda: invalidate(invoices),
+        )
+        set_json_backend()
+    report(f"{COUNT} decoded invoices", results)
+
+
+if __name__ == "__main__":
+    main()
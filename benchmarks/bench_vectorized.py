@@ -0,0 +1,31 @@
+"""
+Bulk decoding throughput, `decode()` in a loop against the NumPy
+`decode_bulk`, both without signature verification, which neither vectorizes.
+Needs the numpy extra: uv run --extra numpy python benchmarks/bench_vectorized.py
+"""
+
+from common import bench, make_payment_requests, report
+
+from bolt11 import decode
+from bolt11.vectorized import decode_bulk, verify_checksums
+
+COUNT = 5_000
+
+
+def main() -> None:
+    prs = make_payment_requests(COUNT)
+    results = {}
+    results["decode"] = bench(
+        "decode", lambda: [decode(pr, verify=False) for pr in prs], COUNT
+    )
+    results["decode_bulk"] = bench(
+        "decode_bulk", lambda: decode_bulk(prs, verify=False), COUNT
+    )
+    results["verify_checksums"] = bench(
+        "verify_checksums", lambda: verify_checksums(prs), COUNT
+    )
+    report("bulk decoding throughput", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Signature verification and payee recovery, serial loop against
+`verify_many` / `recover_payees_many` on growing thread pools.
+"""
+
+import os
+
+from common import bench, make_payment_requests, report
+
+from bolt11 import decode, recover_payees_many, verify_many
+from bolt11.models.signature import recovery_cache
+
+COUNT = 2000
+
+
+def main() -> None:
+    payment_requests = make_payment_requests(COUNT)
+    # measure the ECDSA work, not hits in the cache of recovered payees
+    recovery_cache.resize(0)
+    threads = [1, 2, 4, 8, os.cpu_count() or 1]
+    print(f"{COUNT} invoices, {os.cpu_count()} cpus")
+
+    # verify() stores the recovered payee, start every run unverified
+    def unverified():
+        return [decode(pr, verify=False) for pr in payment_requests]
+
+    results = {}
+    results["serial loop"] = bench(
+        "verify: serial loop",
+        lambda invoices: [invoice.verify() for invoice in invoices],
+        COUNT,
+        setup=unverified,
+    )
+    for count in sorted(set(threads)):
+        results[f"threads={count}"] = bench(
+            f"verify_many: threads={count}",
+            lambda invoices: verify_many(invoices, threads=count),
+            COUNT,
+            setup=unverified,
+        )
+    report("verify scaling", results)
+
+    results = {}
+    signatures = [invoice.signature for invoice in unverified()]
+    results["serial loop"] = bench(
+        "recover: serial loop",
+        lambda: [signature.recover_public_key() for signature in signatures],
+        COUNT,
+    )
+    for count in sorted(set(threads)):
+        results[f"threads={count}"] = bench(
+            f"recover_payees_many: threads={count}",
+            lambda: recover_payees_many(signatures, threads=count),
+            COUNT,
+        )
+    report("recover scaling", results)
+
+
+if __name__ == "__main__":
+    main()
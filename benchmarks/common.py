@@ -0,0 +1,68 @@
+"""
+shared helpers for the benchmarks, run them from the repository root:
+$ uv run python benchmarks/bench_verify.py
+"""
+
+import time
+from hashlib import sha256
+from typing import Any, Callable, Dict, List, Optional
+
+from bolt11 import Bolt11, MilliSatoshi, Tag, TagChar, Tags, encode
+
+PRIVATE_KEY = "e126f68f7eafcc8b74f54d269fe206be715000f94dac067d1c04a8ca3b2db734"
+
+
+def make_invoice(index: int, extra_tags: Optional[List[Tag]] = None) -> Bolt11:
+    """A distinct invoice per index, so no two share a signature."""
+    tags = Tags(
+        [
+            Tag(TagChar.payment_hash, sha256(b"hash%d" % index).hexdigest()),
+            Tag(TagChar.payment_secret, sha256(b"secret%d" % index).hexdigest()),
+            Tag(TagChar.description, f"benchmark invoice {index}"),
+            Tag(TagChar.expire_time, 3600),
+            Tag(TagChar.min_final_cltv_expiry, 80),
+            *(extra_tags or []),
+        ]
+    )
+    return Bolt11(
+        currency="bc",
+        date=1_700_000_000 + index,
+        tags=tags,
+        amount_msat=MilliSatoshi(1000 * (index + 1)),
+    )
+
+
+def make_payment_requests(
+    count: int, extra_tags: Optional[List[Tag]] = None
+) -> List[str]:
+    return [encode(make_invoice(i, extra_tags), PRIVATE_KEY) for i in range(count)]
+
+
+def bench(
+    name: str,
+    func: Callable[..., Any],
+    items: int,
+    repeat: int = 3,
+    setup: Optional[Callable[[], Any]] = None,
+) -> float:
+    """
+    Print and return the best items per second out of `repeat` runs.
+    The result of `setup`, run untimed before each run, is passed to `func`.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        args = (setup(),) if setup else ()
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    rate = items / best
+    print(f"{name:<48} {best * 1000:10.2f} ms {rate:12.0f} /s")
+    return rate
+
+
+def report(title: str, results: Dict[str, float]) -> None:
+    print()
+    print(title)
+    baseline = next(iter(results.values()))
+    for name, rate in results.items():
+        print(f"  {name:<46} {rate / baseline:6.2f}x")
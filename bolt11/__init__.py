@@ -1,22 +1,39 @@
-from .decode import decode
+from .aio import AsyncBolt11, async_decode, async_decode_many, async_encode
+from .batch import decode_many, decode_stream, recover_payees_many, verify_many
+from .decode import decode, decode_cache, decode_cached, peek, quick_check
 from .encode import encode
 from .exceptions import Bolt11Exception
+from .json_backend import set_json_backend
 from .models.fallback import Fallback
 from .models.features import Feature, FeatureExtra, Features, FeatureState
 from .models.routehint import Route, RouteHint
 from .models.signature import Signature
 from .models.tags import Tag, TagChar, Tags
-from .types import Bolt11, MilliSatoshi
+from .types import Bolt11, Bolt11Header, MilliSatoshi
 from .utils import amount_to_btc, btc_to_amount
 
 __all__ = [
+    "AsyncBolt11",
     "Bolt11",
     "Bolt11Exception",
+    "Bolt11Header",
     "MilliSatoshi",
     "amount_to_btc",
+    "async_decode",
+    "async_decode_many",
+    "async_encode",
     "btc_to_amount",
     "decode",
+    "decode_cache",
+    "decode_cached",
+    "decode_many",
+    "decode_stream",
+    "recover_payees_many",
+    "verify_many",
     "encode",
+    "peek",
+    "quick_check",
+    "set_json_backend",
     "Fallback",
     "Feature",
     "Features",
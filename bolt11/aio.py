@@ -0,0 +1,116 @@
+"""asyncio API, running decode and encode off the event loop"""
+
+import asyncio
+from concurrent.futures import Executor
+from functools import partial
+from typing import Any, Callable, Iterable, List, Optional
+from weakref import WeakKeyDictionary
+
+from .batch import DecodeResult, _decode_or_exception
+from .decode import decode
+from .encode import encode
+from .types import Bolt11
+
+
+class AsyncBolt11:
+    """
+    Runs `decode()` and `encode()` on `executor`, the loop's default thread
+    pool if None, with at most `concurrency` calls in flight. Further callers
+    wait on a semaphore, so a burst can not queue unbounded work. Decoding is
+    pure python and holds the GIL, pass a `ProcessPoolExecutor` to keep it
+    from competing with the event loop. With a process pool `encode()` can not
+    set `invoice.signature` on the caller's invoice.
+    """
+
+    def __init__(
+        self, executor: Optional[Executor] = None, concurrency: int = 8
+    ) -> None:
+        self.executor = executor
+        self.concurrency = concurrency
+        # asyncio primitives are bound to one loop
+        self._semaphores: WeakKeyDictionary[
+            asyncio.AbstractEventLoop, asyncio.Semaphore
+        ] = WeakKeyDictionary()
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if not semaphore:
+            semaphore = asyncio.Semaphore(self.concurrency)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+    async def _run(self, func: Callable[..., Any], *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        async with self._semaphore():
+            return await loop.run_in_executor(self.executor, partial(func, *args))
+
+    async def decode(
+        self, pr: str, ignore_exceptions: bool = False, strict: bool = False
+    ) -> Bolt11:
+        return await self._run(decode, pr, ignore_exceptions, strict)
+
+    async def encode(
+        self,
+        invoice: Bolt11,
+        private_key: Optional[str] = None,
+        ignore_exceptions: bool = False,
+        strict: bool = False,
+        keep_payee: bool = False,
+    ) -> str:
+        return await self._run(
+            encode, invoice, private_key, ignore_exceptions, strict, keep_payee
+        )
+
+    async def decode_many(
+        self,
+        payment_requests: Iterable[str],
+        ignore_exceptions: bool = False,
+        strict: bool = False,
+    ) -> List[DecodeResult]:
+        """
+        Decode payment requests concurrently, in input order, with the exception
+        in place of an invoice that fails to decode. Payment requests are only
+        taken from the iterable when a slot is free.
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphore()
+        futures = []
+        for pr in payment_requests:
+            await semaphore.acquire()
+            future = loop.run_in_executor(
+                self.executor,
+                partial(_decode_or_exception, pr, ignore_exceptions, strict),
+            )
+            future.add_done_callback(lambda _: semaphore.release())
+            futures.append(future)
+        return await asyncio.gather(*futures)
+
+
+_default = AsyncBolt11()
+
+
+async def async_decode(
+    pr: str, ignore_exceptions: bool = False, strict: bool = False
+) -> Bolt11:
+    return await _default.decode(pr, ignore_exceptions, strict)
+
+
+async def async_encode(
+    invoice: Bolt11,
+    private_key: Optional[str] = None,
+    ignore_exceptions: bool = False,
+    strict: bool = False,
+    keep_payee: bool = False,
+) -> str:
+    return await _default.encode(
+        invoice, private_key, ignore_exceptions, strict, keep_payee
+    )
+
+
+async def async_decode_many(
+    payment_requests: Iterable[str],
+    ignore_exceptions: bool = False,
+    strict: bool = False,
+) -> List[DecodeResult]:
+    return await _default.decode_many(payment_requests, ignore_exceptions, strict)
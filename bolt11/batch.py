@@ -0,0 +1,111 @@
+"""batch decoding of bolt11 payment requests"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+from .decode import decode
+from .models.signature import Signature
+from .types import Bolt11
+
+DecodeResult = Union[Bolt11, Exception]
+VerifyResult = Union[bool, Exception]
+RecoverResult = Union[str, Exception]
+
+LIGHTNING_PREFIX = "lightning:"
+
+
+def _normalize(line: str) -> str:
+    pr = line.strip()
+    if pr[: len(LIGHTNING_PREFIX)].lower() == LIGHTNING_PREFIX:
+        pr = pr[len(LIGHTNING_PREFIX) :]
+    return pr
+
+
+def _decode_or_exception(
+    pr: str, ignore_exceptions: bool = False, strict: bool = False
+) -> DecodeResult:
+    try:
+        return decode(pr, ignore_exceptions=ignore_exceptions, strict=strict)
+    except Exception as exc:
+        return exc
+
+
+def _verify_or_exception(invoice: Bolt11) -> VerifyResult:
+    try:
+        return invoice.verify()
+    except Exception as exc:
+        return exc
+
+
+def _recover_or_exception(signature: Signature) -> RecoverResult:
+    try:
+        return signature.recover_public_key()
+    except Exception as exc:
+        return exc
+
+
+def decode_many(
+    payment_requests: Iterable[str],
+    workers: Optional[int] = None,
+    chunksize: int = 64,
+    ignore_exceptions: bool = False,
+    strict: bool = False,
+) -> List[DecodeResult]:
+    """
+    Decode payment requests across a process pool, in input order.
+    A payment request that fails to decode gives its exception instead of
+    aborting the batch. `workers=1` decodes in the current process.
+    """
+    decode_one = partial(
+        _decode_or_exception, ignore_exceptions=ignore_exceptions, strict=strict
+    )
+    if workers == 1:
+        return [decode_one(pr) for pr in payment_requests]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(decode_one, payment_requests, chunksize=chunksize))
+
+
+def decode_stream(
+    lines: Union[str, os.PathLike, Iterable[str]],
+    ignore_exceptions: bool = False,
+    strict: bool = False,
+) -> Iterator[Tuple[int, DecodeResult]]:
+    """
+    Lazily decode one payment request per line of a file path, text file or
+    iterable, yielding `(index, invoice or exception)`. Whitespace and
+    `lightning:` prefixes are stripped, blank lines are skipped but counted.
+    """
+    if isinstance(lines, (str, os.PathLike)):
+        with open(lines) as file:
+            yield from decode_stream(file, ignore_exceptions, strict)
+        return
+    for index, line in enumerate(lines):
+        pr = _normalize(line)
+        if pr:
+            yield index, _decode_or_exception(pr, ignore_exceptions, strict)
+
+
+def verify_many(
+    invoices: Iterable[Bolt11], threads: Optional[int] = None
+) -> List[VerifyResult]:
+    """
+    Run `Bolt11.verify()` for invoices decoded with `verify=False` on a thread
+    pool, in input order. libsecp256k1 is called through cffi which releases
+    the GIL, so the ECDSA work runs in parallel without pickling invoices.
+    """
+    if threads == 1:
+        return [_verify_or_exception(invoice) for invoice in invoices]
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        return list(executor.map(_verify_or_exception, invoices))
+
+
+def recover_payees_many(
+    signatures: Iterable[Signature], threads: Optional[int] = None
+) -> List[RecoverResult]:
+    """Recover the payee public keys of signatures on a thread pool, in order."""
+    if threads == 1:
+        return [_recover_or_exception(signature) for signature in signatures]
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        return list(executor.map(_recover_or_exception, signatures))
@@ -0,0 +1,91 @@
+"""bech32 codec,
+based on the reference implementation https://github.com/sipa/bech32/tree/master/ref/python
+without its 90 character limit, bolt11 payment requests are a lot longer.
+"""
+
+from functools import lru_cache
+from typing import Iterable, List, Tuple, Union
+
+CHARSET = "qpzry9x8gf2tvdw0s3jn54khce6mua7l"
+
+GENERATOR = (0x3B6A57B2, 0x26508E6D, 0x1EA119FA, 0x3D4233DD, 0x2A1462B3)
+
+
+def _generator_table() -> Tuple[int, ...]:
+    """Precomputed xor of the generators selected by the 5 bits shifted out."""
+    table = []
+    for top in range(32):
+        chk = 0
+        for i in range(5):
+            if (top >> i) & 1:
+                chk ^= GENERATOR[i]
+        table.append(chk)
+    return tuple(table)
+
+
+_generator = _generator_table()
+
+# ascii code to 5-bit value, 0xFF for characters outside CHARSET
+_decode_table = bytes(
+    CHARSET.index(chr(i)) if chr(i) in CHARSET else 0xFF for i in range(256)
+)
+# 5-bit value to ascii code
+_encode_table = CHARSET.encode().ljust(256, b"\x00")
+
+
+def bech32_polymod(values: Iterable[int], chk: int = 1) -> int:
+    """Compute the Bech32 checksum, one table lookup per value."""
+    generator = _generator
+    for value in values:
+        chk = (chk & 0x1FFFFFF) << 5 ^ value ^ generator[chk >> 25]
+    return chk
+
+
+def bech32_hrp_expand(hrp: str) -> List[int]:
+    """Expand the HRP into values for checksum computation."""
+    return [ord(x) >> 5 for x in hrp] + [0] + [ord(x) & 31 for x in hrp]
+
+
+@lru_cache(maxsize=64)
+def _hrp_polymod(hrp: str) -> int:
+    """Checksum state after the expanded HRP, the same few HRPs keep coming."""
+    return bech32_polymod(bech32_hrp_expand(hrp))
+
+
+def bech32_verify_checksum(hrp: str, data: Iterable[int]) -> bool:
+    """Verify a checksum given HRP and converted data characters."""
+    return bech32_polymod(data, _hrp_polymod(hrp)) == 1
+
+
+def bech32_create_checksum(hrp: str, data: Iterable[int]) -> List[int]:
+    """Compute the checksum values given HRP and data."""
+    chk = bech32_polymod(data, _hrp_polymod(hrp))
+    polymod = bech32_polymod((0, 0, 0, 0, 0, 0), chk) ^ 1
+    return [(polymod >> 5 * (5 - i)) & 31 for i in range(6)]
+
+
+def bech32_encode(hrp: str, data: Iterable[int]) -> str:
+    """Compute a Bech32 string given HRP and data values."""
+    data = list(data)
+    combined = bytes(data + bech32_create_checksum(hrp, data))
+    return hrp + "1" + combined.translate(_encode_table).decode()
+
+
+def bech32_decode(bech: str) -> Union[Tuple[None, None], Tuple[str, List[int]]]:
+    """Validate a Bech32 string, and determine HRP and data."""
+    if not bech.isascii() or not bech.isprintable() or " " in bech:
+        return (None, None)
+    if bech.lower() != bech and bech.upper() != bech:
+        return (None, None)
+    bech = bech.lower()
+    pos = bech.rfind("1")
+    if pos < 1 or pos > 83 or pos + 7 > len(bech):
+        return (None, None)
+    values = bech[pos + 1 :].encode().translate(_decode_table)
+    if b"\xff" in values:
+        return (None, None)
+    hrp = bech[:pos]
+    data = list(values)
+    if not bech32_verify_checksum(hrp, data):
+        return (None, None)
+    return (hrp, data[:-6])
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Sequence
 
 from bitstring import BitArray, Bits, ConstBitStream, pack
 
@@ -39,3 +39,44 @@ def trim_to_bytes(barr: Bits) -> bytes:
     if barr.len % 8 != 0:
         return b[:-1]
     return b
+
+
+# 5-bit values to base 32 digits
+_base32_digits = bytes.maketrans(bytes(range(32)), b"0123456789abcdefghijklmnopqrstuv")
+
+
+def u5_to_int(arr: Sequence[int]) -> int:
+    """
+    Fold a sequence of 5-bit values into a big-endian integer. Parsed as base
+    32 digits, which is linear, shifting in one value at a time is quadratic.
+    """
+    digits = bytes(arr).translate(_base32_digits)
+    return int(digits, 32) if digits else 0
+
+
+def u5_to_bytes(arr: Sequence[int], pad: bool = False) -> bytes:
+    """
+    Pack 5-bit values into bytes. A trailing partial byte is dropped,
+    like `trim_to_bytes`, or zero padded when `pad` is set.
+    """
+    length = len(arr) * 5
+    value = u5_to_int(arr)
+    if pad:
+        size = (length + 7) // 8
+        value <<= size * 8 - length
+    else:
+        size = length // 8
+        value >>= length - size * 8
+    return value.to_bytes(size, "big")
+
+
+def u5_to_bits(arr: Sequence[int]) -> Bits:
+    """Same as `u5_to_bitarray`, without appending symbol by symbol."""
+    return Bits(bytes=u5_to_bytes(arr, pad=True), length=len(arr) * 5)
+
+
+def bits_to_u5(barr: Bits) -> List[int]:
+    """Split into 5-bit values, the last one zero padded."""
+    count = (barr.len + 4) // 5
+    value = (barr.uint if barr.len else 0) << (count * 5 - barr.len)
+    return [(value >> 5 * i) & 31 for i in range(count - 1, -1, -1)]
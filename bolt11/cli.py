@@ -1,12 +1,18 @@
 """bolt11 CLI"""
 
 import json
+import os
 import sys
-from typing import Optional
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Deque, Iterable, Iterator, List, Optional, TextIO, Tuple
 
 import click
 from bitstring import Bits
 
+from . import json_backend
+from .batch import _normalize
 from .decode import decode as bolt11_decode
 from .encode import encode as bolt11_encode
 from .exceptions import Bolt11Exception
@@ -47,6 +53,104 @@ def decode(bolt11, ignore_exceptions, strict):
     click.echo(decoded.json)
 
 
+def _decode_lines(
+    lines: List[Tuple[int, str]], ignore_exceptions: bool, strict: bool
+) -> Tuple[List[str], int]:
+    """JSON results of numbered lines and the number of errors among them."""
+    results = []
+    errors = 0
+    for number, pr in lines:
+        try:
+            invoice = bolt11_decode(
+                pr, ignore_exceptions=ignore_exceptions, strict=strict
+            )
+            results.append(f'{{"line": {number}, "invoice": {invoice.json}}}')
+        except Exception as exc:
+            error = {"line": number, "error": str(exc), "type": type(exc).__name__}
+            results.append(json_backend.dumps(error))
+            errors += 1
+    return results, errors
+
+
+def _chunks(file: TextIO, chunksize: int) -> Iterator[List[Tuple[int, str]]]:
+    """Non blank lines with their 1-based line number, `chunksize` at a time."""
+    chunk = []
+    for number, line in enumerate(file, 1):
+        pr = _normalize(line)
+        if pr:
+            chunk.append((number, pr))
+        if len(chunk) == chunksize:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _decode_chunks(
+    chunks: Iterable[List[Tuple[int, str]]],
+    workers: int,
+    ignore_exceptions: bool,
+    strict: bool,
+) -> Iterator[Tuple[List[str], int]]:
+    """
+    Results of each chunk in input order. A few chunks per worker are in
+    flight, the input is read as results are written.
+    """
+    if workers == 1:
+        for chunk in chunks:
+            yield _decode_lines(chunk, ignore_exceptions, strict)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending: Deque[Future] = deque()
+        for chunk in chunks:
+            pending.append(
+                executor.submit(_decode_lines, chunk, ignore_exceptions, strict)
+            )
+            if len(pending) >= workers * 4:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+@click.command()
+@click.argument("file", type=click.File("r"), default="-")
+@click.option(
+    "-w",
+    "--workers",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Worker processes, defaults to the number of CPUs.",
+)
+@click.option("--chunksize", type=click.IntRange(min=1), default=256)
+@click.option("--ignore-exceptions/--no-ignore-exceptions", default=True)
+@click.option("--strict", is_flag=True, default=False)
+@click.option("--stats", is_flag=True, default=False, help="Print throughput.")
+def decode_batch(file, workers, chunksize, ignore_exceptions, strict, stats):
+    """
+    decode bolt11 invoices, one per line of FILE or stdin
+
+    Writes a JSON line per invoice in input order, with its line number and
+    the invoice or the error.
+    """
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    count = errors = 0
+    for results, chunk_errors in _decode_chunks(
+        _chunks(file, chunksize), workers, ignore_exceptions, strict
+    ):
+        click.echo("\n".join(results))
+        count += len(results)
+        errors += chunk_errors
+    if stats:
+        elapsed = time.perf_counter() - start
+        rate = count / elapsed if elapsed else 0
+        click.echo(
+            f"decoded {count} invoices, {errors} errors, in {elapsed:.2f} s,"
+            f" {rate:.0f} invoices/s with {workers} workers",
+            err=True,
+        )
+
+
 @click.command()
 @click.argument("json_string", type=str)
 @click.argument("private_key", type=str, default=None, required=False)
@@ -104,6 +208,7 @@ def encode(
 def main():
     """main function"""
     command_group.add_command(decode)
+    command_group.add_command(decode_batch)
     command_group.add_command(decode_features)
     command_group.add_command(encode)
     command_group()
@@ -2,23 +2,68 @@
 based on https://github.com/rustyrussell/lightning-payencode/blob/master/lnaddr.py
 """
 
-from bech32 import CHARSET, bech32_decode
+from functools import partial
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Type
+
 from bitstring import ConstBitStream
 
-from .bit_utils import trim_to_bytes, u5_to_bitarray
+from .bech32 import CHARSET, bech32_decode
+from .bit_utils import (
+    trim_to_bytes,
+    u5_to_bitarray,
+    u5_to_bits,
+    u5_to_bytes,
+    u5_to_int,
+)
+from .cache import LRUCache
 from .exceptions import (
     Bolt11Bech32InvalidException,
+    Bolt11DataTruncatedException,
+    Bolt11Exception,
     Bolt11SignatureTooShortException,
-    Bolt11SignatureVerifyException,
 )
 from .models.fallback import Fallback
 from .models.features import Features
 from .models.routehint import RouteHint
 from .models.signature import Signature
-from .models.tags import TagChar, Tags
-from .types import Bolt11
+from .models.tags import BytesTag, LazyTag, TagChar, Tags
+from .types import Bolt11, Bolt11Header, MilliSatoshi
 from .utils import verify_hrp
 
+# 65 byte signature, 104 5-bit groups
+SIGNATURE_U5_LENGTH = 104
+# 35 bit timestamp, 7 5-bit groups
+TIMESTAMP_U5_LENGTH = 7
+
+# longest invoice other implementations accept, lnd's `maxInvoiceLength`,
+# BOLT11 has no limit, `quick_check` takes it as an opt-in `max_length`
+MAX_PAYMENT_REQUEST_LENGTH = 7089
+# bech32 checksum, 6 5-bit groups
+CHECKSUM_U5_LENGTH = 6
+
+_bech32_chars = frozenset(CHARSET)
+
+# shared by `decode_cached`, resize or clear it at runtime
+decode_cache: LRUCache[Bolt11] = LRUCache(maxsize=1024)
+
+_tag_chars: Dict[int, TagChar] = {CHARSET.find(char.value): char for char in TagChar}
+
+# fields which MUST be skipped if they do not have this data_length
+_fixed_lengths: Dict[TagChar, int] = {
+    TagChar.payment_hash: 52,
+    TagChar.description_hash: 52,
+    TagChar.payment_secret: 52,
+    TagChar.payee: 53,
+}
+
+_hex_tags = (
+    TagChar.payment_hash,
+    TagChar.description_hash,
+    TagChar.payment_secret,
+    TagChar.payee,
+    TagChar.metadata,
+)
+
 
 def _pull_tagged(stream):
     tag = stream.read(5).uint
@@ -26,23 +71,102 @@ def _pull_tagged(stream):
     return (CHARSET[tag], stream.read(length * 5), stream)
 
 
-def decode(
-    pr: str,
-    ignore_exceptions: bool = False,
-    strict: bool = False,
-) -> Bolt11:
-    pr = pr.lower()
+def _skip_tagged(tag: TagChar, data_length: int, tags: Tags) -> bool:
+    # MUST skip over unknown fields, OR an f field with unknown version, OR p, h,
+    # s or n fields that do NOT have data_lengths of 52, 52, 52 or 53, respectively.
+    if tag in _fixed_lengths and data_length != _fixed_lengths[tag]:
+        return True
+    if tag == TagChar.route_hint:
+        return False
+    if tag == TagChar.description_hash or tag == TagChar.description:
+        return tags.has(TagChar.description) or tags.has(TagChar.description_hash)
+    return tags.has(tag)
 
-    hrp, bech32_data = bech32_decode(pr)
-    if hrp is None or bech32_data is None:
-        raise Bolt11Bech32InvalidException()
 
-    currency, amount_msat = verify_hrp(hrp)
-    data = u5_to_bitarray(bech32_data)
+def _parse_int(data: Sequence[int]) -> int:
+    # an empty field is no integer, like `Bits.uint` in the legacy decoder
+    if not data:
+        raise ValueError("Cannot interpret a zero length bitstring as an integer.")
+    return u5_to_int(data)
+
+
+def _parse_tagged(tag: TagChar, data: Sequence[int], currency: str) -> Any:
+    if tag in _hex_tags:
+        return u5_to_bytes(data)
+    if tag == TagChar.description:
+        return u5_to_bytes(data).decode()
+    if tag == TagChar.expire_time or tag == TagChar.min_final_cltv_expiry:
+        return _parse_int(data)
+    if tag == TagChar.fallback:
+        return Fallback.from_u5(bytes(data), currency)
+    if tag == TagChar.features:
+        return Features.from_bitstring(u5_to_bits(data))
+    if tag == TagChar.route_hint:
+        return RouteHint.from_bytes(u5_to_bytes(data))
+    raise ValueError(f"Unknown tag: {tag}")
+
+
+def _scan_tagged(data: List[int]) -> Iterator[Tuple[Optional[TagChar], int, int]]:
+    """
+    Index the tagged fields between timestamp and signature, yields
+    `(tag, start, end)`. Unknown tags are yielded as None.
+    """
+    signature_start = len(data) - SIGNATURE_U5_LENGTH
+    if signature_start < TIMESTAMP_U5_LENGTH:
+        raise Bolt11DataTruncatedException()
+    pos = TIMESTAMP_U5_LENGTH
+    while pos < signature_start:
+        if pos + 3 > signature_start:
+            raise Bolt11DataTruncatedException()
+        tag = _tag_chars.get(data[pos])
+        start = pos + 3
+        pos = start + data[pos + 1] * 32 + data[pos + 2]
+        if pos > signature_start:
+            raise Bolt11DataTruncatedException()
+        yield tag, start, pos
+
+
+def _parse_tags(data: List[int], currency: str, lazy: bool = False) -> Tags:
+    """
+    Parse the tagged fields from the 5-bit groups. With `lazy` they are only
+    indexed, their data is parsed on first access.
+    """
+    tags = Tags()
+    for tag, start, end in _scan_tagged(data):
+        if tag is None or _skip_tagged(tag, end - start, tags):
+            continue
+        if tag in _hex_tags:
+            # a few bytes, less to keep than a lazy loader
+            tags.append(BytesTag(tag, _parse_tagged(tag, data[start:end], currency)))
+        elif lazy:
+            # a byte per 5-bit group, keeps far less alive than a list slice
+            load = partial(_parse_tagged, tag, bytes(data[start:end]), currency)
+            tags.append(LazyTag(tag, load))
+        else:
+            tags.add(tag, _parse_tagged(tag, data[start:end], currency))
+    return tags
 
-    # final signature 65 bytes, split it off.
-    if len(data) < 65 * 8:
-        raise Bolt11SignatureTooShortException()
+
+def _decode_u5(
+    hrp: str, data: List[int], currency: str, lazy: bool = False
+) -> Tuple[int, Tags, Signature]:
+    """Decode timestamp, tagged fields and signature from the 5-bit groups."""
+    tags = _parse_tags(data, currency, lazy)
+    timestamp = u5_to_int(data[:TIMESTAMP_U5_LENGTH])
+    signature_start = len(data) - SIGNATURE_U5_LENGTH
+    signature = Signature(
+        signature_data=u5_to_bytes(data[signature_start:]),
+        signing_data=u5_to_bytes(data[:signature_start], pad=True),
+        hrp=hrp,
+    )
+    return timestamp, tags, signature
+
+
+def _decode_bitstring(
+    hrp: str, bech32_data: List[int], currency: str
+) -> Tuple[int, Tags, Signature]:
+    """Original `bitstring` based decoder, kept for comparison."""
+    data = u5_to_bitarray(bech32_data)
 
     # extract the signature
     signature_data = data[-65 * 8 :].tobytes()
@@ -53,7 +177,6 @@ def decode(
     timestamp = data_part.read(35).uint
 
     tags = Tags()
-    payee = None
 
     while data_part.pos != data_part.len:
         tag, tagdata, data_part = _pull_tagged(data_part)
@@ -95,10 +218,9 @@ def decode(
             and data_length == 53
             and not tags.has(TagChar.payee)
         ):
-            payee = trim_to_bytes(tagdata).hex()
             tags.add(
                 TagChar.payee,
-                payee,
+                trim_to_bytes(tagdata).hex(),
             )
         elif (
             tag == TagChar.description.value
@@ -145,20 +267,86 @@ def decode(
         signing_data=data_part.tobytes(),
         hrp=hrp,
     )
+    return timestamp, tags, signature
+
+
+def _precheck(pr: str) -> Optional[Type[Bolt11Exception]]:
+    """
+    Cheap structural checks on a lowercased payment request before the bech32
+    checksum, those of `bech32_decode`. Returns the exception to raise if it
+    can not be valid, the same one the full decoding would raise.
+    """
+    if not pr.isascii() or not pr.isprintable() or " " in pr:
+        return Bolt11Bech32InvalidException
+    pos = pr.rfind("1")
+    if pos < 1 or pos > 83 or pos + 1 + CHECKSUM_U5_LENGTH > len(pr):
+        return Bolt11Bech32InvalidException
+    if not _bech32_chars.issuperset(pr[pos + 1 :]):
+        return Bolt11Bech32InvalidException
+    return None
 
-    # A reader MUST check that the `signature` is valid (see the `n` tagged field
-    # specified below). A reader MUST use the `n` field to validate the signature
-    # instead of performing signature recovery if a valid `n` field is provided.
-    if payee:
-        try:
-            signature.verify(payee)
-        except Exception as exc:
-            raise Bolt11SignatureVerifyException() from exc
+
+def quick_check(pr: str, max_length: Optional[int] = None) -> bool:
+    """
+    Fast pre-filter, False if `pr` can not be a bolt11 payment request.
+    True does not mean it decodes, checksum and tagged fields are not checked.
+    BOLT11 sets no length limit, `max_length` rejects longer strings, for
+    example `MAX_PAYMENT_REQUEST_LENGTH`.
+    """
+    if max_length is not None and len(pr) > max_length:
+        return False
+    pr = pr.lower()
+    if _precheck(pr) or not pr.startswith("ln"):
+        return False
+    # `ln` plus at least 2 characters of currency, a signature and checksum
+    pos = pr.rfind("1")
+    data_length = len(pr) - pos - 1
+    return pos >= 4 and data_length >= SIGNATURE_U5_LENGTH + CHECKSUM_U5_LENGTH
+
+
+def _split(pr: str) -> Tuple[str, List[int], str, Optional[MilliSatoshi]]:
+    """Check the bech32 string, returns hrp, 5-bit data, currency and amount."""
+    pr = pr.lower()
+
+    error = _precheck(pr)
+    if error:
+        raise error()
+
+    hrp, bech32_data = bech32_decode(pr)
+    if hrp is None or bech32_data is None:
+        raise Bolt11Bech32InvalidException()
+
+    currency, amount_msat = verify_hrp(hrp)
+
+    # final signature 65 bytes, split it off.
+    if len(bech32_data) < SIGNATURE_U5_LENGTH:
+        raise Bolt11SignatureTooShortException()
+
+    return hrp, bech32_data, currency, amount_msat
+
+
+def decode(
+    pr: str,
+    ignore_exceptions: bool = False,
+    strict: bool = False,
+    legacy: bool = False,
+    lazy: bool = False,
+    verify: bool = True,
+) -> Bolt11:
+    """
+    Decode a bolt11 payment request.
+    `legacy` selects the original `bitstring` based decoder.
+    `lazy` defers parsing tagged fields until they are read, errors in
+    a field's data are raised on access then. Ignored with `legacy`.
+    `verify=False` skips the signature check, it runs on `Bolt11.verify()`
+    or when the `payee` is first read.
+    """
+    hrp, bech32_data, currency, amount_msat = _split(pr)
+
+    if legacy:
+        timestamp, tags, signature = _decode_bitstring(hrp, bech32_data, currency)
     else:
-        tags.add(
-            TagChar.payee,
-            signature.recover_public_key(),
-        )
+        timestamp, tags, signature = _decode_u5(hrp, bech32_data, currency, lazy)
 
     bolt11 = Bolt11(
         currency=currency,
@@ -167,8 +355,69 @@ def decode(
         signature=signature,
         tags=tags,
     )
+    return _check(bolt11, ignore_exceptions, strict, verify)
+
+
+def _check(
+    bolt11: Bolt11, ignore_exceptions: bool, strict: bool, verify: bool
+) -> Bolt11:
+    if verify:
+        bolt11.verify()
+    else:
+        bolt11._unverified = True
 
     if not ignore_exceptions:
         bolt11.validate(strict=strict)
 
     return bolt11
+
+
+def peek(pr: str) -> Bolt11Header:
+    """
+    Read currency, amount, timestamp, expiry and payment hash of a payment
+    request. Only the bech32 checksum and hrp are checked, the signature is
+    not verified and tagged fields are scanned until both `p` and `x` are
+    found, without parsing the others.
+    """
+    _, data, currency, amount_msat = _split(pr)
+    payment_hash: Optional[str] = None
+    expiry: Optional[int] = None
+    for tag, start, end in _scan_tagged(data):
+        if tag == TagChar.payment_hash and not payment_hash and end - start == 52:
+            payment_hash = u5_to_bytes(data[start:end]).hex()
+        elif tag == TagChar.expire_time and expiry is None:
+            expiry = _parse_int(data[start:end])
+        if payment_hash and expiry is not None:
+            break
+    return Bolt11Header(
+        currency=currency,
+        amount_msat=amount_msat,
+        date=u5_to_int(data[:TIMESTAMP_U5_LENGTH]),
+        expiry=3600 if expiry is None else expiry,
+        payment_hash=payment_hash,
+    )
+
+
+def decode_cached(
+    pr: str,
+    ignore_exceptions: bool = False,
+    strict: bool = False,
+    expire: bool = True,
+) -> Bolt11:
+    """
+    `decode()` behind the bounded `decode_cache`, keyed by the normalized
+    payment request and flags. Cached invoices are shared between callers and
+    must not be mutated. With `expire`, an invoice is only cached until its
+    `expiry_time`.
+    """
+    pr = pr.strip().lower()
+    key = (pr, ignore_exceptions, strict)
+    bolt11 = decode_cache.get(key)
+    if bolt11:
+        return bolt11
+    bolt11 = decode(pr, ignore_exceptions=ignore_exceptions, strict=strict)
+    if not expire:
+        decode_cache.set(key, bolt11)
+    elif not bolt11.has_expired():
+        decode_cache.set(key, bolt11, expires_at=bolt11.expiry_time)
+    return bolt11
@@ -1,8 +1,8 @@
 from typing import Optional
 
-from bech32 import bech32_encode
 from bitstring import BitArray, Bits, pack
 
+from .bech32 import bech32_encode
 from .bit_utils import bitarray_to_u5
 from .exceptions import (
     Bolt11InvalidDescriptionHashException,
@@ -57,8 +57,8 @@ def encode(
     keep_payee: bool = False,
 ) -> str:
     try:
-        if invoice.description_hash:
-            bytes.fromhex(invoice.description_hash)
+        # hex is only converted on access, fail early on an invalid one
+        invoice.description_hash_bytes
     except Exception as exc:
         raise Bolt11InvalidDescriptionHashException() from exc
 
@@ -67,17 +67,17 @@ def encode(
 
     for tag in invoice.tags:
         if tag.char == TagChar.payment_hash:
-            tags += _tagged_bytes(tag.bech32, bytes.fromhex(tag.data))
+            tags += _tagged_bytes(tag.bech32, tag.raw)
         elif tag.char == TagChar.payment_secret:
-            tags += _tagged_bytes(tag.bech32, bytes.fromhex(tag.data))
+            tags += _tagged_bytes(tag.bech32, tag.raw)
         elif tag.char == TagChar.description:
             tags += _tagged_bytes(tag.bech32, tag.data.encode())
         elif tag.char == TagChar.description_hash:
-            tags += _tagged_bytes(tag.bech32, bytes.fromhex(tag.data))
+            tags += _tagged_bytes(tag.bech32, tag.raw)
         elif tag.char == TagChar.metadata:
-            tags += _tagged_bytes(tag.bech32, bytes.fromhex(tag.data))
+            tags += _tagged_bytes(tag.bech32, tag.raw)
         elif tag.char == TagChar.payee and keep_payee:
-            tags += _tagged_bytes(tag.bech32, bytes.fromhex(tag.data))
+            tags += _tagged_bytes(tag.bech32, tag.raw)
         elif tag.char == TagChar.features:
             tags += _tagged_bytes(tag.bech32, tag.data.data)
         elif tag.char == TagChar.fallback:
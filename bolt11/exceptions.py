@@ -1,6 +1,11 @@
 class Bolt11Exception(Exception):
     """Parent Exception"""
 
+    def __reduce__(self):
+        # subclasses take no arguments, restore the message without `__init__`
+        # so exceptions survive pickling, e.g. from `decode_many` workers.
+        return self.__class__.__new__, (self.__class__, *self.args)
+
 
 class Bolt11NoPaymentHashException(Bolt11Exception):
     """
@@ -84,6 +89,15 @@ class Bolt11SignatureTooShortException(Bolt11Exception):
         super().__init__("Too short to contain signature")
 
 
+class Bolt11DataTruncatedException(Bolt11Exception):
+    """
+    Timestamp or a tagged field runs past the signature.
+    """
+
+    def __init__(self):
+        super().__init__("Data part is truncated")
+
+
 class Bolt11HrpInvalidException(Bolt11Exception):
     """
     Invalid Human Readable Part.
@@ -0,0 +1,39 @@
+"""JSON encoder of `Bolt11.json`, the standard library unless another is set."""
+
+import json
+from typing import Any, Callable, Union
+
+JsonDumps = Callable[[Any], str]
+
+dumps: JsonDumps = json.dumps
+
+
+def _orjson_dumps() -> JsonDumps:
+    try:
+        import orjson
+    except ImportError as exc:
+        raise ImportError(
+            "the orjson backend needs orjson, install bolt11[orjson]"
+        ) from exc
+
+    def orjson_dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+
+    return orjson_dumps
+
+
+def set_json_backend(backend: Union[None, str, JsonDumps] = None) -> None:
+    """
+    Set the function serializing `Bolt11.json`, "orjson" or any callable
+    returning a str. None restores `json.dumps`. orjson output is compact,
+    without the spaces `json.dumps` puts after separators.
+    """
+    global dumps
+    if backend is None:
+        dumps = json.dumps
+    elif backend == "orjson":
+        dumps = _orjson_dumps()
+    elif callable(backend):
+        dumps = backend
+    else:
+        raise ValueError(f"Unknown JSON backend: {backend}")
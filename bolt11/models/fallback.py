@@ -1,10 +1,11 @@
-from typing import NamedTuple, Optional
+from typing import Optional
 
 from base58 import b58decode_check, b58encode_check
-from bech32 import bech32_decode, bech32_encode
 from bitstring import Bits, pack
 
-from ..bit_utils import bitarray_to_u5, u5_to_bitarray
+from ..bech32 import bech32_decode, bech32_encode
+from ..bit_utils import bits_to_u5, u5_to_bitarray, u5_to_bits, u5_to_bytes
+from ..cache import LRUCache
 
 base58_prefix_map = {"bc": (0, 5), "tb": (111, 196)}
 
@@ -17,22 +18,61 @@ def is_p2sh(currency, prefix):
     return prefix == base58_prefix_map[currency][1]
 
 
-class Fallback(NamedTuple):
-    """Fallback onchain address"""
+class Fallback:
+    """
+    Fallback onchain address, kept as the 5-bit groups of the tagged field.
+    The address is computed on first access. Read-only, `from_address()`
+    shares instances between callers.
+    """
 
-    data: Bits
-    currency: str
+    __slots__ = ("_groups", "_currency", "_address")
+
+    def __init__(self, data: Bits, currency: str) -> None:
+        self._groups = bytes(bits_to_u5(data))
+        self._currency = currency
+        self._address: Optional[str] = None
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Fallback):
+            return NotImplemented
+        return self._groups == other._groups and self._currency == other._currency
+
+    def __hash__(self) -> int:
+        return hash((self._groups, self._currency))
+
+    def __repr__(self) -> str:
+        return f"Fallback(data={self.data!r}, currency={self.currency!r})"
+
+    def __reduce__(self):
+        return (Fallback, (self.data, self.currency))
 
     @classmethod
-    def from_bitstring(cls, data: Bits, currency) -> Optional["Fallback"]:
-        # fallback address type 19 are ignored
-        wver = data[0:5].uint
-        if wver == 19:
+    def from_u5(cls, groups: bytes, currency: str) -> Optional["Fallback"]:
+        # empty fields and fallback address type 19 are ignored
+        if not groups or groups[0] == 19:
             return None
-        return cls(data, currency)
+        fallback = cls.__new__(cls)
+        fallback._groups = bytes(groups)
+        fallback._currency = currency
+        fallback._address = None
+        return fallback
+
+    @classmethod
+    def from_bitstring(cls, data: Bits, currency) -> Optional["Fallback"]:
+        return cls.from_u5(bytes(bits_to_u5(data)), currency)
 
     @classmethod
     def from_address(cls, address: str, currency: str) -> "Fallback":
+        """Memoized in `address_cache`, the returned fallback is shared."""
+        key = (address, currency)
+        fallback = address_cache.get(key)
+        if not fallback:
+            fallback = cls._from_address(address, currency)
+            address_cache.set(key, fallback)
+        return fallback
+
+    @classmethod
+    def _from_address(cls, address: str, currency: str) -> "Fallback":
         if currency == "bc" or currency == "tb":
             fbhrp, witness = bech32_decode(address)
             if fbhrp:
@@ -58,8 +98,17 @@ class Fallback(NamedTuple):
                 "Support for currency {} not implemented".format(currency)
             )
 
+    @property
+    def currency(self) -> str:
+        return self._currency
+
     @property
     def address(self) -> str:
+        if self._address is None:
+            self._address = self._encode_address()
+        return self._address
+
+    def _encode_address(self) -> str:
         if self.currency in ["bc", "tb"]:
             wver = self.witness_version
             prefix = self.b58prefix
@@ -68,19 +117,33 @@ class Fallback(NamedTuple):
             elif wver == 18:
                 return self.b58encode_check(prefix[1])
             elif wver <= 16:
-                return bech32_encode(self.currency, bitarray_to_u5(self.data))
+                return bech32_encode(self.currency, self._groups)
             else:
                 raise ValueError("Unknown witness version")
         else:
             raise ValueError("Unknown currency")
 
     def b58encode_check(self, prefix) -> str:
-        return b58encode_check(bytes([prefix]) + self.data[5:].tobytes()).decode()
+        program = u5_to_bytes(self._groups[1:], pad=True)
+        return b58encode_check(bytes([prefix]) + program).decode()
 
     @property
     def b58prefix(self) -> tuple:
         return base58_prefix_map[self.currency]
 
+    @property
+    def raw(self) -> bytes:
+        """The 5-bit groups, a byte each, as `from_u5` takes them."""
+        return self._groups
+
+    @property
+    def data(self) -> Bits:
+        return u5_to_bits(self._groups)
+
     @property
     def witness_version(self) -> int:
-        return self.data[0:5].uint
+        return self._groups[0]
+
+
+# decoded addresses, keyed by address and currency
+address_cache: LRUCache[Fallback] = LRUCache(maxsize=1024)
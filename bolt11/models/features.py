@@ -1,9 +1,8 @@
 import json
 from enum import Enum
-from math import floor
 from typing import Dict, NamedTuple, Optional, Union
 
-from bitstring import BitArray, Bits
+from bitstring import Bits
 
 from bolt11.exceptions import Bolt11FeatureException
 
@@ -34,69 +33,94 @@ class Feature(Enum):
     option_zeroconf = 17
 
 
+# len() of an Enum is slow, this is checked per feature bit
+_feature_count = len(Feature)
+_states = (FeatureState.required, FeatureState.supported)
+_features_by_name = {feature.name: feature for feature in Feature}
+_states_by_name = {state.name: state for state in FeatureState}
+
+
 class FeatureExtra:
-    def __init__(self, index: int):
-        if index < len(Feature):
+    """Feature bit unknown to this library, one shared instance per index."""
+
+    __slots__ = ("feature_index", "name")
+    _instances: Dict[int, "FeatureExtra"] = {}
+
+    feature_index: int
+    name: str
+
+    def __new__(cls, index: int) -> "FeatureExtra":
+        extra = cls._instances.get(index)
+        if extra:
+            return extra
+        if index < _feature_count:
             raise Bolt11FeatureException(
-                f"FeatureExtra must be greater than {len(Feature) - 1}"
+                f"FeatureExtra must be greater than {_feature_count - 1}"
             )
-        self.feature_index = index
+        extra = super().__new__(cls)
+        extra.feature_index = index
+        extra.name = f"extra_{index}"
+        return cls._instances.setdefault(index, extra)
+
+    def __reduce__(self):
+        return (FeatureExtra, (self.feature_index,))
 
     @property
     def value(self) -> int:
         return self.feature_index
 
-    @property
-    def name(self) -> str:
-        return f"extra_{self.feature_index}"
+
+def _feature_mask(
+    feature_list: Dict[Union[Feature, FeatureExtra], FeatureState],
+) -> int:
+    mask = 0
+    for feature, feature_state in feature_list.items():
+        if feature_state == FeatureState.required:
+            mask |= 1 << feature.value * 2
+        elif feature_state == FeatureState.supported:
+            mask |= 1 << feature.value * 2 + 1
+        else:
+            raise ValueError("Unknown feature state")
+    return mask
 
 
 class Features(NamedTuple):
     data: Bits
     feature_list: Dict[Union[Feature, FeatureExtra], FeatureState]
+    # bit `2 * index` set for a required feature, `2 * index + 1` for supported,
+    # 0 when built without one, `has_feature()` then uses `feature_list`
+    mask: int = 0
 
     @classmethod
     def from_bitstring(cls, data: Bits) -> "Features":
-        while data.len % 5 != 0:
-            data = data + "0b0"
-        length = data.length
+        if data.len % 5:
+            data = data + Bits(5 - data.len % 5)
+        mask = data.uint if data.len else 0
         feature_list: Dict[Union[Feature, FeatureExtra], FeatureState] = {}
-        for i in range(0, length):
-            feature_index = floor(i / 2)
-            si = i + 1
-            cut = data[-si : -si + 1] if i > 0 else data[-si:]
-            if cut == "0b1":
-                feature: Union[Feature, FeatureExtra] = (
-                    Feature(feature_index)
-                    if feature_index < len(Feature)
-                    else FeatureExtra(feature_index)
-                )
-                feature_list[feature] = (
-                    FeatureState.supported if i % 2 else FeatureState.required
-                )
-        return cls(data, feature_list)
+        # one pass over the set bits, lowest first
+        bits = bin(mask)[:1:-1]
+        i = bits.find("1")
+        while i != -1:
+            feature_index = i // 2
+            feature: Union[Feature, FeatureExtra] = (
+                Feature(feature_index)
+                if feature_index < _feature_count
+                else FeatureExtra(feature_index)
+            )
+            feature_list[feature] = _states[i % 2]
+            i = bits.find("1", i + 1)
+        return cls(data, feature_list, mask)
 
     @classmethod
     def from_feature_list(
         cls, feature_list: Dict[Union[Feature, FeatureExtra], FeatureState]
     ) -> "Features":
-        length = max([feature.value + 1 for feature in feature_list]) * 2
-        data = BitArray(length=length)
-        for feature, feature_state in feature_list.items():
-            if feature_state == FeatureState.required:
-                data.invert(feature.value * 2)
-            elif feature_state == FeatureState.supported:
-                data.invert(feature.value * 2 + 1)
-            else:
-                raise ValueError("Unknown feature state")
-        # Remove trailing zeroes
-        while data[-1:] == "0b0":
-            data = BitArray(data[:-1])
-        # add zeroes
-        while data.len % 5 != 0:
-            data = data + "0b0"
-        data.reverse()
-        return cls(data, feature_list)
+        if not feature_list:
+            raise ValueError("Empty feature list")
+        mask = _feature_mask(feature_list)
+        # zero padded to full 5-bit groups
+        length = -(-mask.bit_length() // 5) * 5
+        return cls(Bits(uint=mask, length=length), feature_list, mask)
 
     @property
     def readable(self) -> Dict[str, str]:
@@ -113,21 +137,33 @@ class Features(NamedTuple):
     def from_dict(cls, data: dict) -> "Features":
         features: Dict[Union[Feature, FeatureExtra], FeatureState] = {}
         for char, value in data.items():
-            if char in Feature._member_map_:
-                features[Feature(Feature._member_map_.get(char))] = FeatureState(
-                    FeatureState._member_map_.get(value)
-                )
+            state = _states_by_name.get(value)
+            if state is None:
+                raise ValueError(f"invalid feature state: {value}")
+            feature = _features_by_name.get(char)
+            if feature:
+                features[feature] = state
             else:
                 if not char.startswith("extra_"):
                     raise ValueError(f"invalid feature char: {char}")
-                extra_bit = int(char.replace("extra_", ""))
-                features[FeatureExtra(extra_bit)] = FeatureState(
-                    FeatureState._member_map_.get(value)
-                )
+                features[FeatureExtra(int(char[6:]))] = state
         return cls.from_feature_list(features)
 
     def has_feature(self, feature_string: str) -> Optional[str]:
-        for feature, feature_state in self.feature_list.items():
-            if feature.name == feature_string:
-                return feature_state.name
+        feature = _features_by_name.get(feature_string)
+        if feature:
+            index = feature.value
+        elif feature_string.startswith("extra_") and feature_string[6:].isdigit():
+            index = int(feature_string[6:])
+            if index < _feature_count:
+                return None
+        else:
+            return None
+        mask = self.mask
+        if not mask and self.feature_list:
+            mask = _feature_mask(self.feature_list)
+        if mask >> index * 2 + 1 & 1:
+            return FeatureState.supported.name
+        if mask >> index * 2 & 1:
+            return FeatureState.required.name
         return None
@@ -1,9 +1,16 @@
-from typing import List, NamedTuple
+from struct import Struct
+from typing import Iterator, List, NamedTuple, Optional, Sequence, Tuple
 
-from bitstring import BitArray, Bits, ConstBitStream, pack
+from bitstring import Bits
 
 from ..bit_utils import int_to_scid, scid_to_int
 
+# BOLT #11:
+# `pubkey` (264 bits), `short_channel_id` (64 bits), `fee_base_msat` (32 bits,
+# big-endian), `fee_proportional_millionths` (32 bits, big-endian),
+# `cltv_expiry_delta` (16 bits, big-endian)
+_hop = Struct(">33sQIIH")
+
 
 class Route(NamedTuple):
     public_key: str
@@ -13,38 +20,83 @@ class Route(NamedTuple):
     cltv_expiry_delta: int
 
 
-class RouteHint(NamedTuple):
-    routes: List[Route]
+class RouteHint:
+    """
+    Hops of a route hint, kept packed as in the invoice, 51 bytes each.
+    `routes` builds a new tuple of `Route` tuples on every access, a hint is
+    not changed in place. Like other sequences, a hint without hops is falsy.
+    """
+
+    __slots__ = ("_packed",)
+
+    def __init__(self, routes: Optional[Sequence[Route]] = None) -> None:
+        routes = routes or []
+        packed = bytearray(len(routes) * _hop.size)
+        for i, route in enumerate(routes):
+            public_key = bytes.fromhex(route.public_key)
+            if len(public_key) != 33:
+                raise ValueError("public_key must be 33 bytes")
+            _hop.pack_into(
+                packed,
+                i * _hop.size,
+                public_key,
+                scid_to_int(route.short_channel_id),
+                route.base_fee,
+                route.ppm_fee,
+                route.cltv_expiry_delta,
+            )
+        self._packed = bytes(packed)
+
+    def __iter__(self) -> Iterator[Route]:
+        for public_key, scid, base_fee, ppm_fee, cltv in _hop.iter_unpack(self._packed):
+            yield Route(
+                public_key=public_key.hex(),
+                short_channel_id=int_to_scid(scid),
+                base_fee=base_fee,
+                ppm_fee=ppm_fee,
+                cltv_expiry_delta=cltv,
+            )
+
+    def __len__(self) -> int:
+        return len(self._packed) // _hop.size
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, RouteHint):
+            return NotImplemented
+        return self._packed == other._packed
+
+    def __hash__(self) -> int:
+        return hash(self._packed)
+
+    def __repr__(self) -> str:
+        return f"RouteHint(routes={self.routes!r})"
+
+    def __reduce__(self):
+        return (RouteHint.from_bytes, (self._packed,))
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "RouteHint":
+        """From packed hops, a trailing partial hop is ignored."""
+        route_hint = cls.__new__(cls)
+        route_hint._packed = bytes(data[: len(data) - len(data) % _hop.size])
+        return route_hint
 
     @classmethod
     def from_bitstring(cls, data: Bits) -> "RouteHint":
-        stream = ConstBitStream(data)
-        route_hints = []
-        while stream.pos + 264 + 64 + 32 + 32 + 16 < stream.len:
-            route = Route(
-                public_key=stream.read(264).tobytes().hex(),
-                short_channel_id=int_to_scid(stream.read(64).intbe),
-                base_fee=stream.read(32).intbe,
-                ppm_fee=stream.read(32).intbe,
-                cltv_expiry_delta=stream.read(16).intbe,
-            )
-            route_hints.append(route)
-        return cls(routes=route_hints)
+        return cls.from_bytes(data.tobytes())
 
     @classmethod
     def from_list(cls, list_of_routes: List[dict]) -> "RouteHint":
         return cls(routes=[Route(**route) for route in list_of_routes])
 
     @property
-    def data(self) -> Bits:
-        route_hints = BitArray()
-        for route in self.routes:
-            route_hints.append(
-                BitArray(hex=route.public_key)
-                + pack("uintbe:64", scid_to_int(route.short_channel_id))
-                + pack("uintbe:32", route.base_fee)
-                + pack("uintbe:32", route.ppm_fee)
-                + pack("uintbe:16", route.cltv_expiry_delta)
-            )
+    def routes(self) -> Tuple[Route, ...]:
+        return tuple(self)
+
+    @property
+    def raw(self) -> bytes:
+        return self._packed
 
-        return route_hints
+    @property
+    def data(self) -> Bits:
+        return Bits(bytes=self._packed)
@@ -1,15 +1,21 @@
 from dataclasses import dataclass
 from hashlib import sha256
+from typing import Union
 
 from coincurve import PrivateKey, PublicKey, verify_signature
 from coincurve.ecdsa import cdata_to_der, deserialize_recoverable, recoverable_convert
 
+from ..cache import LRUCache
+
+# recovered public keys, keyed by the 65 byte signature and the message hash
+recovery_cache: LRUCache[str] = LRUCache(maxsize=4096)
+
 
 def message(hrp: str, signing_data: bytes) -> bytes:
     return bytes([ord(c) for c in hrp]) + signing_data
 
 
-@dataclass
+@dataclass(slots=True)
 class Signature:
     """An invoice signature."""
 
@@ -31,7 +37,7 @@ class Signature:
         signature_data = key.sign_recoverable(message(hrp, signing_data))
         return cls(hrp=hrp, signing_data=signing_data, signature_data=signature_data)
 
-    def verify(self, payee: str) -> bool:
+    def verify(self, payee: Union[bytes, str]) -> bool:
         if not self.signature_data:
             raise ValueError("No signature data")
         if not self.signing_data:
@@ -40,7 +46,9 @@ class Signature:
         sig = recoverable_convert(sig)
         sig = cdata_to_der(sig)
         if not verify_signature(
-            sig, message(self.hrp, self.signing_data), bytes.fromhex(payee)
+            sig,
+            message(self.hrp, self.signing_data),
+            payee if isinstance(payee, bytes) else bytes.fromhex(payee),
         ):
             raise ValueError("Invalid signature")
         return True
@@ -51,10 +59,14 @@ class Signature:
         if not self.signing_data:
             raise ValueError("No signing data")
 
-        key = PublicKey.from_signature_and_message(
-            self.signature_data, message(self.hrp, self.signing_data)
-        )
-        return key.format(compressed=True).hex()
+        msg = message(self.hrp, self.signing_data)
+        cache_key = self.signature_data + sha256(msg).digest()
+        public_key = recovery_cache.get(cache_key)
+        if not public_key:
+            key = PublicKey.from_signature_and_message(self.signature_data, msg)
+            public_key = key.format(compressed=True).hex()
+            recovery_cache.set(cache_key, public_key)
+        return public_key
 
     @property
     def r(self) -> str:
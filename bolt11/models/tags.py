@@ -1,8 +1,11 @@
 from enum import Enum
-from typing import Any, List, Optional
+from struct import Struct
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
 
-from bech32 import CHARSET
+from bitstring import Bits
 
+from bolt11.bech32 import CHARSET
+from bolt11.models.fallback import Fallback
 from bolt11.models.features import Features
 from bolt11.models.routehint import RouteHint
 
@@ -21,7 +24,25 @@ class TagChar(Enum):
     features = "9"
 
 
+# binary layout of a tag: ascii char, payload length, payload
+_tag_header = Struct(">BH")
+_feature_bits = Struct(">H")
+_binary_chars = {ord(char.value): char for char in TagChar}
+
+_bytes_chars = frozenset(
+    (
+        TagChar.payment_hash,
+        TagChar.description_hash,
+        TagChar.payment_secret,
+        TagChar.payee,
+        TagChar.metadata,
+    )
+)
+
+
 class Tag:
+    __slots__ = ("char", "data")
+
     char: TagChar
     data: Any
 
@@ -34,34 +55,205 @@ class Tag:
         char = self.char.value
         return CHARSET.find(char)
 
+    @property
+    def raw(self) -> bytes:
+        """Data of a hash or key tag as bytes, it may be given as hex."""
+        if isinstance(self.data, bytes):
+            return self.data
+        return bytes.fromhex(self.data)
+
+
+class BytesTag(Tag):
+    """Hash or key tag stored as bytes, `data` is their hex string."""
+
+    __slots__ = ("_raw",)
+
+    def __init__(self, char: TagChar, data: Union[bytes, str]) -> None:
+        self.char = char
+        self.data = data
+
+    @property  # type: ignore[override]
+    def data(self) -> str:
+        return self._raw.hex()
+
+    @data.setter
+    def data(self, data: Union[bytes, str]) -> None:
+        self._raw = bytes(data) if isinstance(data, bytes) else bytes.fromhex(data)
+
+    @property
+    def raw(self) -> bytes:
+        return self._raw
+
+
+class LazyTag(Tag):
+    """Tag which parses its data on first access."""
+
+    __slots__ = ("_load", "_data")
+
+    def __init__(self, char: TagChar, load: Callable[[], Any]) -> None:
+        self.char = char
+        self._load: Optional[Callable[[], Any]] = load
+        self._data: Any = None
+
+    @property  # type: ignore[override]
+    def data(self) -> Any:
+        if self._load:
+            self._data = self._load()
+            self._load = None
+        return self._data
+
+    @data.setter
+    def data(self, data: Any) -> None:
+        self._data = data
+        self._load = None
+
+
+class TagList(List[Tag]):
+    """List of tags which counts the changes made to it."""
+
+    __slots__ = ("changes",)
+
+    def __init__(self, tags: Iterable[Tag] = ()) -> None:
+        super().__init__(tags)
+        self.changes = 0
+
+    def __reduce__(self):
+        return (TagList, (list(self),))
+
+
+def _counted(name: str) -> Callable:
+    method = getattr(list, name)
+
+    def counted(self: TagList, *args: Any) -> Any:
+        result = method(self, *args)
+        self.changes += 1
+        return result
+
+    counted.__name__ = name
+    return counted
+
+
+for _name in (
+    "__setitem__",
+    "__delitem__",
+    "__iadd__",
+    "__imul__",
+    "append",
+    "extend",
+    "insert",
+    "pop",
+    "remove",
+    "clear",
+    "sort",
+    "reverse",
+):
+    setattr(TagList, _name, _counted(_name))
+
 
 class Tags:
-    tags: List[Tag]
+    """
+    Tagged fields in insertion order, indexed by char for constant time
+    `has()` and `get()`. Only route hints may repeat, `get()` returns the
+    first tag of a char like a scan would. A list assigned to `tags` is
+    copied into a `TagList`. Changes made through `tags` are seen, changes
+    to the original list are not.
+    """
+
+    __slots__ = ("_tags", "_index", "_route_hints", "_synced", "_version")
 
     def __init__(self, tags: Optional[List[Tag]] = None) -> None:
+        self._version = 0
         self.tags = tags or []
 
+    @property
+    def version(self) -> int:
+        """Counts the changes, for caches built from the tags."""
+        self._sync()
+        return self._version
+
+    @property
+    def tags(self) -> List[Tag]:
+        return self._tags
+
+    @tags.setter
+    def tags(self, tags: List[Tag]) -> None:
+        self._tags = tags if isinstance(tags, TagList) else TagList(tags)
+        self._reindex()
+
     def __iter__(self):
         for tag in self.tags:
             yield tag
 
     def add(self, char: TagChar, data: Any) -> None:
-        self.tags.append(Tag(char, data))
+        self.append(Tag(char, data))
+
+    def append(self, tag: Tag) -> None:
+        self._sync()
+        self._tags.append(tag)
+        self._index_tag(tag)
+        self._synced = self._tags.changes
 
     def has(self, char: TagChar) -> bool:
-        for tag in self.tags:
-            if tag.char == char:
-                return True
-        return False
+        self._sync()
+        return char in self._index
 
     def get(self, char: TagChar) -> Optional[Tag]:
-        for tag in self.tags:
-            if tag.char == char:
-                return tag
-        return None
+        self._sync()
+        return self._index.get(char)
 
     def get_route_hints(self) -> List[RouteHint]:
-        return [tag.data for tag in self.tags if tag.char == TagChar.route_hint]
+        self._sync()
+        return [tag.data for tag in self._route_hints]
+
+    def _index_tag(self, tag: Tag) -> None:
+        self._index.setdefault(tag.char, tag)
+        if tag.char == TagChar.route_hint:
+            self._route_hints.append(tag)
+        self._version += 1
+
+    def _reindex(self) -> None:
+        self._version += 1
+        self._index: Dict[TagChar, Tag] = {}
+        self._route_hints: List[Tag] = []
+        for tag in self._tags:
+            self._index_tag(tag)
+        self._synced = self._tags.changes
+
+    def _sync(self) -> None:
+        # the list is public, catch any change made to it directly
+        if self._synced != self._tags.changes:
+            self._reindex()
+
+    def to_bytes(self) -> bytes:
+        """
+        Tags in order as `char, length, payload`: raw hashes and keys, utf-8
+        description, big-endian integers, the 5-bit groups of a fallback,
+        packed route hint hops, and the bit length and bitmask of features.
+        """
+        chunks = []
+        for tag in self:
+            payload = _pack_tag(tag)
+            if len(payload) > 0xFFFF:
+                raise ValueError(f"Tag {tag.char.value} too long to serialize")
+            chunks.append(_tag_header.pack(ord(tag.char.value), len(payload)))
+            chunks.append(payload)
+        return b"".join(chunks)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, currency: str) -> "Tags":
+        tags = []
+        pos = 0
+        while pos < len(data):
+            code, length = _tag_header.unpack_from(data, pos)
+            char = _binary_chars.get(code)
+            if not char:
+                raise ValueError(f"invalid tag char: {chr(code)}")
+            start = pos + _tag_header.size
+            pos = start + length
+            if pos > len(data):
+                raise ValueError("Truncated tag data")
+            tags.append(_unpack_tag(char, data[start:pos], currency))
+        return cls(tags)
 
     @classmethod
     def from_dict(cls, data: dict) -> "Tags":
@@ -80,3 +272,40 @@ class Tags:
             else:
                 raise ValueError(f"invalid tag char: {char}")
         return cls(tags)
+
+
+def _pack_tag(tag: Tag) -> bytes:
+    char = tag.char
+    if char in _bytes_chars:
+        return tag.raw
+    data = tag.data
+    if char == TagChar.description:
+        return data.encode()
+    if char == TagChar.expire_time or char == TagChar.min_final_cltv_expiry:
+        return data.to_bytes((data.bit_length() + 7) // 8, "big")
+    if char == TagChar.fallback:
+        # an ignored fallback type is kept as None
+        return data.raw if data else b""
+    if char == TagChar.route_hint:
+        return data.raw
+    if char == TagChar.features:
+        return _feature_bits.pack(data.data.len) + data.data.tobytes()
+    raise ValueError(f"Unknown tag: {char}")
+
+
+def _unpack_tag(char: TagChar, payload: bytes, currency: str) -> Tag:
+    if char in _bytes_chars:
+        return BytesTag(char, payload)
+    if char == TagChar.description:
+        return Tag(char, payload.decode())
+    if char == TagChar.expire_time or char == TagChar.min_final_cltv_expiry:
+        return Tag(char, int.from_bytes(payload, "big"))
+    if char == TagChar.fallback:
+        # an empty payload is read back as None
+        return Tag(char, Fallback.from_u5(payload, currency))
+    if char == TagChar.route_hint:
+        return Tag(char, RouteHint.from_bytes(payload))
+    # features
+    (length,) = _feature_bits.unpack_from(payload)
+    bits = Bits(bytes=payload, offset=_feature_bits.size * 8, length=length)
+    return Tag(char, Features.from_bitstring(bits))
@@ -1,30 +1,48 @@
-import json
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field, fields
 from datetime import datetime
 from decimal import Decimal
-from typing import List, Optional
+from struct import Struct
+from struct import error as StructError
+from typing import Any, List, NamedTuple, Optional, Tuple, Union
 
+from . import json_backend
 from .exceptions import (
     Bolt11DescriptionException,
     Bolt11NoMinFinalCltvException,
     Bolt11NoPaymentHashException,
     Bolt11NoPaymentSecretException,
     Bolt11NoSignatureException,
+    Bolt11SignatureVerifyException,
 )
+from .json_backend import JsonDumps
 from .models.fallback import Fallback
 from .models.features import Features
 from .models.routehint import RouteHint
 from .models.signature import Signature
-from .models.tags import TagChar, Tags
+from .models.tags import BytesTag, TagChar, Tags
+
+# binary layout version, bumped on any change to it
+BINARY_VERSION = 1
+# version, flags, date, amount and currency lengths, then the big-endian
+# amount and the currency
+_binary_header = Struct(">BBQBB")
+# hrp, signing data and signature data lengths, then the three of them
+_binary_signature = Struct(">BHB")
+_has_amount = 1
+_has_signature = 2
+_is_unverified = 4
 
 
 class MilliSatoshi(int):
     """A thousandth of a satoshi."""
 
     @classmethod
-    def from_btc(cls, btc: Decimal) -> "MilliSatoshi":
-        return cls(btc * 100_000_000_000)
+    def from_btc(cls, btc: Union[int, Decimal]) -> "MilliSatoshi":
+        """Exact, fractions of a millisatoshi are truncated like `int()`."""
+        numerator, denominator = Decimal(btc).as_integer_ratio()
+        msat = abs(numerator) * 100_000_000_000 // denominator
+        return cls(msat if numerator >= 0 else -msat)
 
     @property
     def btc(self) -> Decimal:
@@ -35,7 +53,24 @@ class MilliSatoshi(int):
         return self // 1000
 
 
-@dataclass
+class Bolt11Header(NamedTuple):
+    """Invoice header fields, as read by `peek()`."""
+
+    currency: str
+    amount_msat: Optional[MilliSatoshi]
+    date: int
+    expiry: int
+    payment_hash: Optional[str]
+
+    @property
+    def expiry_time(self) -> int:
+        return self.date + self.expiry
+
+    def has_expired(self) -> bool:
+        return time.time() > self.expiry_time
+
+
+@dataclass(slots=True)
 class Bolt11:
     """Bolt11 Lightning invoice."""
 
@@ -44,6 +79,145 @@ class Bolt11:
     tags: Tags
     amount_msat: Optional[MilliSatoshi] = None
     signature: Optional[Signature] = None
+    # set by `decode(verify=False)`, signature work is deferred to `verify()`
+    _unverified: bool = field(default=False, init=False, repr=False, compare=False)
+    # `data` and `json` with the tags version they were built from
+    _data: Optional[Tuple[int, dict]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _json: Optional[Tuple[dict, JsonDumps, str]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        if name not in ("_data", "_json", "_unverified"):
+            object.__setattr__(self, "_data", None)
+
+    def __getstate__(self) -> dict:
+        # the caches may hold an unpicklable JSON backend
+        return {
+            f.name: getattr(self, f.name)
+            for f in fields(self)
+            if f.name not in ("_data", "_json")
+        }
+
+    def __setstate__(self, state: dict) -> None:
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+        object.__setattr__(self, "_data", None)
+        object.__setattr__(self, "_json", None)
+
+    def to_bytes(self) -> bytes:
+        """
+        Compact binary serialization, a header, the signature and the tags as
+        in `Tags.to_bytes()`. `from_bytes()` restores it exactly. Raises
+        ValueError for a value the layout can not hold, like a negative date.
+        """
+        try:
+            return self._to_bytes()
+        except (StructError, OverflowError) as exc:
+            raise ValueError(f"Invoice does not fit the binary format: {exc}") from exc
+
+    def _to_bytes(self) -> bytes:
+        flags = 0
+        if self.amount_msat is not None:
+            flags |= _has_amount
+        if self.signature:
+            flags |= _has_signature
+        if self._unverified:
+            flags |= _is_unverified
+        amount_msat = self.amount_msat or 0
+        amount = amount_msat.to_bytes((amount_msat.bit_length() + 7) // 8, "big")
+        currency = self.currency.encode()
+        chunks = [
+            _binary_header.pack(
+                BINARY_VERSION, flags, self.date, len(amount), len(currency)
+            ),
+            amount,
+            currency,
+        ]
+        if self.signature:
+            hrp = self.signature.hrp.encode()
+            signing_data = self.signature.signing_data
+            signature_data = self.signature.signature_data
+            chunks += [
+                _binary_signature.pack(
+                    len(hrp), len(signing_data), len(signature_data)
+                ),
+                hrp,
+                signing_data,
+                signature_data,
+            ]
+        chunks.append(self.tags.to_bytes())
+        return b"".join(chunks)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Bolt11":
+        """
+        Load an invoice serialized by `to_bytes()`. The signature is not
+        verified again, an invoice saved unverified stays deferred.
+        """
+        try:
+            version, flags, date, amount_length, currency_length = (
+                _binary_header.unpack_from(data)
+            )
+            if version != BINARY_VERSION:
+                raise ValueError(f"Unsupported binary format version: {version}")
+            pos = _binary_header.size + amount_length
+            amount_msat = int.from_bytes(data[_binary_header.size : pos], "big")
+            currency = data[pos : pos + currency_length].decode()
+            pos += currency_length
+            signature = None
+            if flags & _has_signature:
+                lengths = _binary_signature.unpack_from(data, pos)
+                pos += _binary_signature.size
+                parts = []
+                for length in lengths:
+                    parts.append(data[pos : pos + length])
+                    pos += length
+                hrp, signing_data, signature_data = parts
+                signature = Signature(
+                    hrp=hrp.decode(),
+                    signing_data=bytes(signing_data),
+                    signature_data=bytes(signature_data),
+                )
+            if pos > len(data):
+                raise ValueError("Truncated binary invoice")
+            tags = Tags.from_bytes(data[pos:], currency)
+        except StructError as exc:
+            raise ValueError("Truncated binary invoice") from exc
+        invoice = cls(
+            currency=currency,
+            date=date,
+            tags=tags,
+            amount_msat=MilliSatoshi(amount_msat) if flags & _has_amount else None,
+            signature=signature,
+        )
+        invoice._unverified = bool(flags & _is_unverified)
+        return invoice
+
+    def verify(self) -> bool:
+        """
+        Verify the signature against the `n` field, or recover the payee
+        from the signature if there is none.
+        """
+        if not self.signature:
+            raise Bolt11NoSignatureException()
+        # A reader MUST check that the `signature` is valid (see the `n` tagged field
+        # specified below). A reader MUST use the `n` field to validate the signature
+        # instead of performing signature recovery if a valid `n` field is provided.
+        payee = self.tags.get(TagChar.payee)
+        if payee:
+            try:
+                self.signature.verify(payee.raw)
+            except Exception as exc:
+                raise Bolt11SignatureVerifyException() from exc
+        else:
+            payee = BytesTag(TagChar.payee, self.signature.recover_public_key())
+            self.tags.append(payee)
+        self._unverified = False
+        return True
 
     def validate(self, strict: bool = False) -> None:
         if not self.tags.get(TagChar.payment_hash):
@@ -87,11 +261,21 @@ class Bolt11:
         tag = self.tags.get(TagChar.description_hash)
         return tag.data if tag else None
 
+    @property
+    def description_hash_bytes(self) -> Optional[bytes]:
+        tag = self.tags.get(TagChar.description_hash)
+        return tag.raw if tag else None
+
     @property
     def metadata(self) -> Optional[str]:
         tag = self.tags.get(TagChar.metadata)
         return tag.data if tag else None
 
+    @property
+    def metadata_bytes(self) -> Optional[bytes]:
+        tag = self.tags.get(TagChar.metadata)
+        return tag.raw if tag else None
+
     # backwards compatibility
     @property
     def dt(self) -> datetime:
@@ -146,18 +330,63 @@ class Bolt11:
             raise Bolt11NoPaymentHashException()
         return payment_hash.data
 
+    @property
+    def payment_hash_bytes(self) -> bytes:
+        payment_hash = self.tags.get(TagChar.payment_hash)
+        if not payment_hash:
+            raise Bolt11NoPaymentHashException()
+        return payment_hash.raw
+
     @property
     def payment_secret(self) -> Optional[str]:
         tag = self.tags.get(TagChar.payment_secret)
         return tag.data if tag else None
 
+    @property
+    def payment_secret_bytes(self) -> Optional[bytes]:
+        tag = self.tags.get(TagChar.payment_secret)
+        return tag.raw if tag else None
+
     @property
     def payee(self) -> Optional[str]:
+        if self._unverified:
+            self.verify()
         tag = self.tags.get(TagChar.payee)
         return tag.data if tag else None
 
+    @property
+    def payee_bytes(self) -> Optional[bytes]:
+        if self._unverified:
+            self.verify()
+        tag = self.tags.get(TagChar.payee)
+        return tag.raw if tag else None
+
     @property
     def data(self) -> dict:
+        """
+        Cached until a field is assigned or the tags list changes. Changing a
+        tag's data in place is not tracked, assign `tags` again after that.
+        """
+        data = dict(self._cached_data())
+        # the nested containers of the cache are not handed out either
+        if "features" in data:
+            data["features"] = dict(data["features"])
+        if "route_hints" in data:
+            data["route_hints"] = [
+                [dict(route) for route in route_hint]
+                for route_hint in data["route_hints"]
+            ]
+        return data
+
+    def _cached_data(self) -> dict:
+        if self._data and self._data[0] == self.tags.version:
+            return self._data[1]
+        data = self._build_data()
+        # read after building, a deferred `verify()` adds the payee tag
+        self._data = (self.tags.version, data)
+        return data
+
+    def _build_data(self) -> dict:
         data = {
             "currency": self.currency,
             "amount_msat": int(self.amount_msat) if self.amount_msat else 0,
@@ -192,4 +421,9 @@ class Bolt11:
 
     @property
     def json(self) -> str:
-        return json.dumps(self.data)
+        """Serialized with the backend set by `set_json_backend()`."""
+        data = self._cached_data()
+        dumps = json_backend.dumps
+        if not self._json or self._json[0] is not data or self._json[1] is not dumps:
+            self._json = (data, dumps, dumps(data))
+        return self._json[2]
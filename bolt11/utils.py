@@ -1,16 +1,47 @@
 from decimal import Decimal
-from re import fullmatch, match
+from functools import lru_cache
 from typing import Optional, Tuple, Union
 
 from .exceptions import Bolt11AmountInvalidException, Bolt11HrpInvalidException
 from .types import MilliSatoshi
 
+# BOLT #11:
+# The following `multiplier` letters are defined:
+#
+# * `m` (milli): multiply by 0.001
+# * `u` (micro): multiply by 0.000001
+# * `n` (nano): multiply by 0.000000001
+# * `p` (pico): multiply by 0.000000000001
+#
+# in pico bitcoin, a tenth of a millisatoshi
+_multipliers = {"p": 1, "n": 10**3, "u": 10**6, "m": 10**9, "": 10**12}
+# largest first, to shorten amounts
+_shorten = ((10**12, ""), (10**9, "m"), (10**6, "u"), (10**3, "n"))
+# longest first, `bcrt` before `bc` and `tbs` before `tb`
+_currencies = ("bcrt", "bc", "tbs", "tb")
+
 
 def verify_hrp(hrp: str) -> Tuple[str, Optional[MilliSatoshi]]:
-    matches = match(r"ln(bcrt|bc|tbs|tb)(\w+)?", hrp)
-    if matches is None:
+    return _verify_hrp(hrp)
+
+
+@lru_cache(maxsize=64)
+def _verify_hrp(hrp: str) -> Tuple[str, Optional[MilliSatoshi]]:
+    """Memoized, the same few HRPs keep coming."""
+    if not hrp.startswith("ln"):
+        raise Bolt11HrpInvalidException()
+    for currency in _currencies:
+        if hrp.startswith(currency, 2):
+            break
+    else:
         raise Bolt11HrpInvalidException()
-    currency, amount_str = matches.groups()
+    # the amount is the word characters after the currency, anything after
+    # them is ignored
+    amount_str = hrp[2 + len(currency) :]
+    for end, char in enumerate(amount_str):
+        if not char.isalnum() and char != "_":
+            amount_str = amount_str[:end]
+            break
     return currency, amount_to_msat(amount_str) if amount_str else None
 
 
@@ -19,21 +50,11 @@ def amount_to_msat(amount: str) -> MilliSatoshi:
     # BOLT #11:
     # A reader SHOULD fail if `amount` contains a non-digit, or is followed by
     # anything except a `multiplier` in the table above.
-    if not fullmatch(r"\d+[pnum]?", amount):
+    multiplier = _multipliers.get(amount[-1:])
+    digits = amount[:-1] if multiplier else amount
+    if not digits.isdecimal():
         raise Bolt11AmountInvalidException()
-
-    try:
-        num = {"p": 10**12, "n": 10**9, "u": 10**6, "m": 10**3}[amount[-1]]
-        # BOLT #11:
-        # The following `multiplier` letters are defined:
-        #
-        # * `m` (milli): multiply by 0.001
-        # * `u` (micro): multiply by 0.000001
-        # * `n` (nano): multiply by 0.000000001
-        # * `p` (pico): multiply by 0.000000000001
-        return MilliSatoshi.from_btc(Decimal(amount[:-1]) / num)
-    except KeyError:
-        return MilliSatoshi.from_btc(Decimal(amount))
+    return MilliSatoshi(int(digits) * (multiplier or 10**12) // 10)
 
 
 def amount_to_sat(amount: str) -> int:
@@ -51,16 +72,12 @@ def msat_to_amount(msat: int) -> str:
     if not isinstance(msat, int):
         raise ValueError("`msat` should be an integer.")
 
+    # in pico bitcoin, shortened with the largest multiplier that divides it
     value = msat * 10
-
-    unit = ""
-    for unit in ["p", "n", "u", "m", ""]:
-        if value % 1000 == 0:
-            value //= 1000
-        else:
-            break
-
-    return f"{value}{unit}"
+    for multiplier, unit in _shorten:
+        if not value % multiplier:
+            return str(value // multiplier) + unit
+    return str(value) + "p"
 
 
 def sat_to_amount(sat: int) -> str:
@@ -70,4 +87,4 @@ def sat_to_amount(sat: int) -> str:
 
 def btc_to_amount(btc: Union[int, Decimal]) -> str:
     """Given an amount in bitcoin, shorten it."""
-    return msat_to_amount(MilliSatoshi.from_btc(Decimal(btc)))
+    return msat_to_amount(MilliSatoshi.from_btc(btc))
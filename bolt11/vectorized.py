@@ -0,0 +1,426 @@
+"""NumPy bulk decoding of payment requests,
+needs the `numpy` extra: pip install bolt11[numpy]
+
+Bech32 checksums and the unpacking of 5-bit data into bytes run on whole
+arrays of payment requests, the tagged fields go through the same parser
+as `decode()`. `decode_to_columns()` skips the invoice objects and returns
+a few fields as arrays.
+"""
+
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Type
+
+try:
+    import numpy as np
+except ImportError as exc:
+    raise ImportError("bolt11.vectorized needs numpy, install bolt11[numpy]") from exc
+
+from .batch import DecodeResult
+from .bech32 import CHARSET, _generator, _hrp_polymod
+from .bit_utils import u5_to_bytes
+from .decode import (
+    CHECKSUM_U5_LENGTH,
+    SIGNATURE_U5_LENGTH,
+    TIMESTAMP_U5_LENGTH,
+    _check,
+    _parse_int,
+    _parse_tags,
+    _precheck,
+    _scan_tagged,
+)
+from .exceptions import (
+    Bolt11AmountInvalidException,
+    Bolt11Bech32InvalidException,
+    Bolt11DataTruncatedException,
+    Bolt11DescriptionException,
+    Bolt11HrpInvalidException,
+    Bolt11NoMinFinalCltvException,
+    Bolt11NoPaymentHashException,
+    Bolt11NoPaymentSecretException,
+    Bolt11SignatureTooShortException,
+    Bolt11SignatureVerifyException,
+)
+from .models.signature import Signature
+from .models.tags import TagChar
+from .types import Bolt11, MilliSatoshi
+from .utils import verify_hrp
+
+# `currency` column of `decode_to_columns()`, -1 for a failed invoice
+CURRENCIES = ("bc", "tb", "tbs", "bcrt")
+# `error` column of `decode_to_columns()`, 0 for none, the last for any other
+COLUMN_ERRORS: Tuple[Optional[Type[Exception]], ...] = (
+    None,
+    Bolt11HrpInvalidException,
+    Bolt11AmountInvalidException,
+    Bolt11Bech32InvalidException,
+    Bolt11SignatureTooShortException,
+    Bolt11DataTruncatedException,
+    Bolt11SignatureVerifyException,
+    Bolt11NoPaymentHashException,
+    Bolt11NoPaymentSecretException,
+    Bolt11NoMinFinalCltvException,
+    Bolt11DescriptionException,
+    UnicodeDecodeError,
+    # an amount or expiry beyond int64, `decode()` accepts it
+    OverflowError,
+    Exception,
+)
+_error_codes = {error: code for code, error in enumerate(COLUMN_ERRORS)}
+_currency_codes = {currency: code for code, currency in enumerate(CURRENCIES)}
+_int64_max = 2**63 - 1
+
+# ascii code to 5-bit value, 0xFF for characters outside CHARSET
+_decode_table = np.full(256, 0xFF, dtype=np.uint8)
+_decode_table[np.frombuffer(CHARSET.encode(), dtype=np.uint8)] = np.arange(32)
+
+_generator_table = np.array(_generator, dtype=np.uint32)
+_bit_shifts = np.arange(4, -1, -1, dtype=np.uint8)
+_timestamp_weights = 32 ** np.arange(TIMESTAMP_U5_LENGTH - 1, -1, -1, dtype=np.int64)
+
+
+def to_u5(data: Sequence[str], min_width: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Map ascii bech32 data parts to a left aligned, zero padded `uint8` matrix
+    of 5-bit values and the length of each row. Characters outside CHARSET
+    map to 0xFF.
+    """
+    lengths = np.fromiter(map(len, data), dtype=np.int64, count=len(data))
+    width = max(int(lengths.max(initial=0)), min_width)
+    raw = np.array(data, dtype=f"S{width}").view(np.uint8)
+    values = _decode_table[raw.reshape(len(data), width)]
+    values[np.arange(width) >= lengths[:, None]] = 0
+    return values, lengths
+
+
+def polymod(values: np.ndarray, lengths: np.ndarray, chk: np.ndarray) -> np.ndarray:
+    """Bech32 polymod of the first `lengths` values of every row, from `chk`."""
+    chk = chk.astype(np.uint32)
+    for col in range(values.shape[1]):
+        step = (chk & 0x1FFFFFF) << 5 ^ values[:, col] ^ _generator_table[chk >> 25]
+        chk = np.where(lengths > col, step, chk)
+    return chk
+
+
+def unpack_u5(values: np.ndarray) -> np.ndarray:
+    """
+    Unpack rows of 5-bit values into zero padded bytes, each row the same as
+    `u5_to_bytes(row, pad=True)`.
+    """
+    bits = (values[:, :, None] >> _bit_shifts) & 1
+    return np.packbits(bits.reshape(len(values), values.shape[1] * 5), axis=1)
+
+
+def _split(
+    prs: Sequence[str],
+) -> Tuple[List[Optional[Exception]], List[str], List[str]]:
+    """The scalar part, pre-check and hrp split of each payment request."""
+    errors: List[Optional[Exception]] = []
+    hrps: List[str] = []
+    data: List[str] = []
+    for pr in prs:
+        pr = pr.lower()
+        error = _precheck(pr)
+        pos = pr.rfind("1")
+        errors.append(error() if error else None)
+        hrps.append(pr[:pos])
+        data.append(pr[pos + 1 :] if errors[-1] is None else "")
+    return errors, hrps, data
+
+
+def _by_length(data: Sequence[str]) -> List[List[int]]:
+    """
+    Indexes of `data` grouped by length, up to the next power of two. A matrix
+    per group is as wide as its own longest string, one oversized payment
+    request does not widen every row of a chunk.
+    """
+    groups: Dict[int, List[int]] = {}
+    for i, pr in enumerate(data):
+        groups.setdefault(len(pr).bit_length(), []).append(i)
+    return [groups[key] for key in sorted(groups)]
+
+
+def verify_checksums(prs: Sequence[str]) -> np.ndarray:
+    """Whether each payment request passes the pre-checks and bech32 checksum."""
+    errors, hrps, data = _split(prs)
+    chk = np.fromiter(map(_hrp_polymod, hrps), dtype=np.uint32, count=len(hrps))
+    valid = np.zeros(len(prs), dtype=bool)
+    for indexes in _by_length(data):
+        values, lengths = to_u5([data[i] for i in indexes])
+        valid[indexes] = polymod(values, lengths, chk[indexes]) == 1
+    return valid & np.array([error is None for error in errors], dtype=bool)
+
+
+class _Chunk(NamedTuple):
+    errors: List[Optional[Exception]]
+    hrps: List[str]
+    valid: np.ndarray
+    # 5-bit groups without checksum, up to `lengths`
+    values: np.ndarray
+    lengths: np.ndarray
+    # shorter than a signature, `lengths` is padded to one
+    short: np.ndarray
+    signatures: np.ndarray
+    signing_data: np.ndarray
+    signing_lengths: np.ndarray
+    timestamps: np.ndarray
+
+    def signature(self, i: int) -> Signature:
+        return Signature(
+            hrp=self.hrps[i],
+            signing_data=self.signing_data[i, : self.signing_lengths[i]].tobytes(),
+            signature_data=self.signatures[i].tobytes(),
+        )
+
+    def error(self, i: int) -> Optional[Exception]:
+        if self.errors[i]:
+            return self.errors[i]
+        if not self.valid[i]:
+            return Bolt11Bech32InvalidException()
+        return None
+
+    def verify_hrp(self, i: int) -> Tuple[str, Optional[MilliSatoshi]]:
+        """`verify_hrp`, then the signature length, in the order of `decode()`."""
+        currency, amount_msat = verify_hrp(self.hrps[i])
+        if self.short[i]:
+            raise Bolt11SignatureTooShortException()
+        return currency, amount_msat
+
+
+def _prepare_chunk(prs: Sequence[str], signatures: bool = True) -> _Chunk:
+    """
+    The array part of decoding, checksums, signatures and timestamps.
+    Without `signatures` their arrays are left empty.
+    """
+    errors, hrps, data = _split(prs)
+    values, lengths = to_u5(data, min_width=SIGNATURE_U5_LENGTH)
+    chk = np.fromiter(map(_hrp_polymod, hrps), dtype=np.uint32, count=len(hrps))
+    valid = polymod(values, lengths, chk) == 1
+
+    # strip the checksum, split off the 65 byte signature
+    short = lengths < SIGNATURE_U5_LENGTH + CHECKSUM_U5_LENGTH
+    lengths = np.maximum(lengths - CHECKSUM_U5_LENGTH, SIGNATURE_U5_LENGTH)
+    columns = np.arange(values.shape[1])
+    values[columns >= lengths[:, None]] = 0
+    signature_start = lengths - SIGNATURE_U5_LENGTH
+    signing_lengths = (signature_start * 5 + 7) // 8
+    signature_data = signing_data = np.zeros((len(prs), 0), dtype=np.uint8)
+    if signatures:
+        signature_index = signature_start[:, None] + np.arange(SIGNATURE_U5_LENGTH)
+        signature_data = unpack_u5(np.take_along_axis(values, signature_index, axis=1))
+        values_signed = np.where(columns < signature_start[:, None], values, 0)
+        signing_data = unpack_u5(values_signed)
+    timestamps = values[:, :TIMESTAMP_U5_LENGTH] @ _timestamp_weights
+    return _Chunk(
+        errors,
+        hrps,
+        valid,
+        values,
+        lengths,
+        short,
+        signature_data,
+        signing_data,
+        signing_lengths,
+        timestamps,
+    )
+
+
+def _decode_chunk(
+    prs: Sequence[str], ignore_exceptions: bool, strict: bool, verify: bool
+) -> List[DecodeResult]:
+    results: Dict[int, DecodeResult] = {}
+    for indexes in _by_length(prs):
+        bucket = [prs[i] for i in indexes]
+        decoded = _decode_bucket(bucket, ignore_exceptions, strict, verify)
+        results.update(zip(indexes, decoded))
+    return [results[i] for i in range(len(prs))]
+
+
+def _decode_bucket(
+    prs: Sequence[str], ignore_exceptions: bool, strict: bool, verify: bool
+) -> List[DecodeResult]:
+    chunk = _prepare_chunk(prs)
+    results: List[DecodeResult] = []
+    for i in range(len(prs)):
+        error = chunk.error(i)
+        if error:
+            results.append(error)
+            continue
+        try:
+            currency, amount_msat = chunk.verify_hrp(i)
+            tags = _parse_tags(chunk.values[i, : chunk.lengths[i]].tolist(), currency)
+            bolt11 = Bolt11(
+                currency=currency,
+                amount_msat=amount_msat,
+                date=int(chunk.timestamps[i]),
+                signature=chunk.signature(i),
+                tags=tags,
+            )
+            results.append(_check(bolt11, ignore_exceptions, strict, verify))
+        except Exception as exc:
+            results.append(exc)
+    return results
+
+
+def decode_bulk(
+    prs: Iterable[str],
+    ignore_exceptions: bool = False,
+    strict: bool = False,
+    verify: bool = True,
+    chunksize: int = 4096,
+) -> List[DecodeResult]:
+    """
+    Decode payment requests in chunks of `chunksize`, in input order, with the
+    exception `decode()` would raise in place of a failed invoice.
+    """
+    results: List[DecodeResult] = []
+    chunk: List[str] = []
+    for pr in prs:
+        chunk.append(pr)
+        if len(chunk) == chunksize:
+            results += _decode_chunk(chunk, ignore_exceptions, strict, verify)
+            chunk = []
+    if chunk:
+        results += _decode_chunk(chunk, ignore_exceptions, strict, verify)
+    return results
+
+
+def _columns_chunk(
+    prs: Sequence[str], ignore_exceptions: bool, strict: bool, verify: bool
+) -> Dict[str, np.ndarray]:
+    buckets = _by_length(prs) or [[]]
+    columns = [
+        _columns_bucket([prs[i] for i in indexes], ignore_exceptions, strict, verify)
+        for indexes in buckets
+    ]
+    # back into input order
+    order = np.argsort(np.concatenate(buckets).astype(np.int64), kind="stable")
+    return {
+        name: np.concatenate([c[name] for c in columns])[order] for name in columns[0]
+    }
+
+
+def _columns_bucket(
+    prs: Sequence[str], ignore_exceptions: bool, strict: bool, verify: bool
+) -> Dict[str, np.ndarray]:
+    chunk = _prepare_chunk(prs, signatures=verify)
+    count = len(prs)
+    amounts = [0] * count
+    expiries = [0] * count
+    cltvs = [0] * count
+    currencies = [-1] * count
+    codes = [0] * count
+    payees = [bytes(33)] * count
+    payment_hashes = [bytes(32)] * count
+    for i in range(count):
+        try:
+            error = chunk.error(i)
+            if error:
+                raise error
+            currency, amount_msat = chunk.verify_hrp(i)
+            data = chunk.values[i, : chunk.lengths[i]].tolist()
+            # the first of each tag, as `decode()` keeps them
+            payment_hash = payee = expiry = cltv = None
+            has_secret = has_description = False
+            for tag, start, end in _scan_tagged(data):
+                if tag == TagChar.payment_hash:
+                    if payment_hash is None and end - start == 52:
+                        payment_hash = u5_to_bytes(data[start:end])
+                elif tag == TagChar.payee:
+                    if payee is None and end - start == 53:
+                        payee = u5_to_bytes(data[start:end])
+                elif tag == TagChar.expire_time:
+                    if expiry is None:
+                        expiry = _parse_int(data[start:end])
+                elif tag == TagChar.min_final_cltv_expiry:
+                    if cltv is None:
+                        cltv = _parse_int(data[start:end])
+                elif tag == TagChar.payment_secret:
+                    has_secret = has_secret or end - start == 52
+                elif tag == TagChar.description_hash:
+                    # skipped like `decode()` does, the first of `d` and `h` wins
+                    has_description = has_description or end - start == 52
+                elif tag == TagChar.description and not has_description:
+                    # `decode()` fails on a description that is not utf-8
+                    u5_to_bytes(data[start:end]).decode()
+                    has_description = True
+            if verify:
+                signature = chunk.signature(i)
+                if payee:
+                    try:
+                        signature.verify(payee)
+                    except Exception as exc:
+                        raise Bolt11SignatureVerifyException() from exc
+                else:
+                    payee = bytes.fromhex(signature.recover_public_key())
+            if not ignore_exceptions:
+                if not payment_hash:
+                    raise Bolt11NoPaymentHashException()
+                if not has_secret:
+                    raise Bolt11NoPaymentSecretException()
+                if strict and cltv is None:
+                    raise Bolt11NoMinFinalCltvException()
+                if not has_description:
+                    raise Bolt11DescriptionException()
+            row = (
+                amount_msat or 0,
+                3600 if expiry is None else expiry,
+                18 if cltv is None else cltv,
+            )
+            if max(row) > _int64_max:
+                raise OverflowError("Value does not fit a 64 bit column")
+        except Exception as exc:
+            codes[i] = _error_codes.get(type(exc), len(COLUMN_ERRORS) - 1)
+            continue
+        amounts[i], expiries[i], cltvs[i] = row
+        currencies[i] = _currency_codes[currency]
+        if payee:
+            payees[i] = payee
+        if payment_hash:
+            payment_hashes[i] = payment_hash
+
+    ok = np.array(codes, dtype=np.int8) == 0
+    return {
+        "amount_msat": np.array(amounts, dtype=np.int64),
+        "date": np.where(ok, chunk.timestamps, 0),
+        "expiry": np.array(expiries, dtype=np.int64),
+        "min_final_cltv_expiry": np.array(cltvs, dtype=np.int64),
+        "payee": np.frombuffer(b"".join(payees), dtype=np.uint8).reshape(count, 33),
+        "payment_hash": (
+            np.frombuffer(b"".join(payment_hashes), dtype=np.uint8).reshape(count, 32)
+        ),
+        "currency": np.array(currencies, dtype=np.int8),
+        "error": np.array(codes, dtype=np.int8),
+    }
+
+
+def decode_to_columns(
+    prs: Iterable[str],
+    ignore_exceptions: bool = False,
+    strict: bool = False,
+    verify: bool = True,
+    chunksize: int = 4096,
+) -> Dict[str, np.ndarray]:
+    """
+    Decode payment requests into a column array per field, in input order,
+    without creating invoice objects. Only the tagged fields of the columns
+    are parsed. Columns:
+
+    - `amount_msat`, 0 without an amount
+    - `date`, `expiry` and `min_final_cltv_expiry`, with their defaults
+    - `payee` and `payment_hash`, `uint8` rows of 33 and 32 bytes, zeros
+      when unknown, without `verify` the payee is only read from `n`
+    - `currency`, the index in `CURRENCIES`
+    - `error`, the index in `COLUMN_ERRORS` of the exception `decode()`
+      would raise, 0 if it decoded, the other columns are 0 otherwise.
+      `OverflowError` marks an invoice that decodes, but whose amount,
+      expiry or min_final_cltv_expiry does not fit the int64 columns
+    """
+    columns: List[Dict[str, np.ndarray]] = []
+    chunk: List[str] = []
+    for pr in prs:
+        chunk.append(pr)
+        if len(chunk) == chunksize:
+            columns.append(_columns_chunk(chunk, ignore_exceptions, strict, verify))
+            chunk = []
+    if chunk or not columns:
+        columns.append(_columns_chunk(chunk, ignore_exceptions, strict, verify))
+    return {name: np.concatenate([c[name] for c in columns]) for name in columns[0]}
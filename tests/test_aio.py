@@ -0,0 +1,60 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+
+from bolt11 import (
+    AsyncBolt11,
+    async_decode,
+    async_decode_many,
+    async_encode,
+    decode,
+)
+from bolt11.exceptions import Bolt11Bech32InvalidException
+
+from .helpers import payment_requests
+
+
+class TestAsync:
+    def test_async_decode_encode(self):
+        async def run():
+            decoded = await async_decode(payment_requests[-1])
+            encoded = await async_encode(decoded, keep_payee=True)
+            return decoded, encoded
+
+        decoded, encoded = asyncio.run(run())
+        assert decoded.data == decode(payment_requests[-1]).data
+        assert encoded == payment_requests[-1]
+
+    def test_async_decode_many(self):
+        invoices = [*payment_requests, "lnbc1invalid"]
+        results = asyncio.run(async_decode_many(invoices))
+        for pr, result in zip(payment_requests, results):
+            assert not isinstance(result, Exception)
+            assert result.payment_hash == decode(pr).payment_hash
+        assert isinstance(results[-1], Bolt11Bech32InvalidException)
+
+    def test_bounded_concurrency(self):
+        codec = AsyncBolt11(concurrency=2)
+        taken = []
+
+        def payment_request_iter():
+            for pr in payment_requests:
+                taken.append(pr)
+                yield pr
+
+        async def run():
+            task = asyncio.ensure_future(codec.decode_many(payment_request_iter()))
+            await asyncio.sleep(0)
+            # only as many payment requests are pulled as there are slots
+            assert len(taken) <= 3
+            return await task
+
+        results = asyncio.run(run())
+        assert len(results) == len(payment_requests)
+
+    def test_process_pool(self):
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            codec = AsyncBolt11(executor=executor, concurrency=4)
+            results = asyncio.run(codec.decode_many(payment_requests))
+        assert [result.payment_hash for result in results] == [
+            decode(pr).payment_hash for pr in payment_requests
+        ]
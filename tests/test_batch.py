@@ -0,0 +1,100 @@
+import pytest
+
+from bolt11 import (
+    TagChar,
+    decode,
+    decode_many,
+    decode_stream,
+    recover_payees_many,
+    verify_many,
+)
+from bolt11.exceptions import (
+    Bolt11Bech32InvalidException,
+    Bolt11NoMinFinalCltvException,
+    Bolt11SignatureVerifyException,
+)
+
+from .helpers import payment_requests
+
+
+class TestDecodeMany:
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_decode_many(self, workers):
+        invoices = [*payment_requests, "lnbc1invalid", payment_requests[0]]
+        results = decode_many(invoices, workers=workers, chunksize=2)
+        assert len(results) == len(invoices)
+        for pr, result in zip(payment_requests, results):
+            assert not isinstance(result, Exception)
+            assert result.data == decode(pr).data
+        assert isinstance(results[-2], Bolt11Bech32InvalidException)
+        assert str(results[-2]) == "Bech32 string is not valid."
+        assert not isinstance(results[-1], Exception)
+        assert results[-1].payment_hash == decode(payment_requests[0]).payment_hash
+
+    def test_decode_many_strict(self):
+        results = decode_many(payment_requests[:2], workers=2, strict=True)
+        assert all(
+            isinstance(result, Bolt11NoMinFinalCltvException) for result in results
+        )
+        results = decode_many(
+            payment_requests[:2], workers=2, strict=True, ignore_exceptions=True
+        )
+        assert not any(isinstance(result, Exception) for result in results)
+
+
+class TestVerifyMany:
+    @pytest.mark.parametrize("threads", [1, 4])
+    def test_verify_many(self, threads):
+        invoices = [decode(pr, verify=False) for pr in payment_requests]
+        assert verify_many(invoices, threads=threads) == [True] * len(invoices)
+        for pr, invoice in zip(payment_requests, invoices):
+            assert invoice.payee == decode(pr).payee
+
+    def test_verify_many_invalid(self):
+        invoice = decode(payment_requests[-1], verify=False)
+        payee = invoice.tags.get(TagChar.payee)
+        assert payee
+        payee.data = (
+            "03b1c1a3dd064c7b4386b688c1f0950fddb28f61f2c3be8bcaf4ef3c78429ffe4e"
+        )
+        result = verify_many([invoice], threads=2)
+        assert isinstance(result[0], Bolt11SignatureVerifyException)
+
+    @pytest.mark.parametrize("threads", [1, 4])
+    def test_recover_payees_many(self, threads):
+        invoices = [decode(pr) for pr in payment_requests]
+        signatures = [invoice.signature for invoice in invoices]
+        payees = recover_payees_many(signatures, threads=threads)
+        assert payees == [invoice.payee for invoice in invoices]
+
+
+class TestDecodeStream:
+    def test_decode_stream(self, tmp_path):
+        lines = [
+            f"  {payment_requests[0]}\n",
+            "\n",
+            f"LIGHTNING:{payment_requests[1].upper()}\n",
+            "not an invoice\n",
+        ]
+        path = tmp_path / "invoices.txt"
+        path.write_text("".join(lines))
+
+        for source in (lines, path, str(path)):
+            results = list(decode_stream(source))
+            assert [index for index, _ in results] == [0, 2, 3]
+            assert (
+                results[0][1].payment_hash == decode(payment_requests[0]).payment_hash
+            )
+            assert (
+                results[1][1].payment_hash == decode(payment_requests[1]).payment_hash
+            )
+            assert isinstance(results[2][1], Bolt11Bech32InvalidException)
+
+    def test_decode_stream_is_lazy(self):
+        def lines():
+            yield payment_requests[0]
+            raise AssertionError("read past the first line")
+
+        index, result = next(decode_stream(lines()))
+        assert index == 0
+        assert not isinstance(result, Exception)
@@ -0,0 +1,58 @@
+import pytest
+
+from bolt11.bech32 import CHARSET, bech32_decode, bech32_encode
+
+from .helpers import payment_requests
+
+
+class TestBech32:
+    """BIP-173 test vectors"""
+
+    @pytest.mark.parametrize(
+        "bech",
+        [
+            "A12UEL5L",
+            "a12uel5l",
+            (
+                "an83characterlonghumanreadablepartthatcontainsthenumber1andthe"
+                "excludedcharactersbio1tt5tgs"
+            ),
+            "abcdef1qpzry9x8gf2tvdw0s3jn54khce6mua7lmqqqxw",
+            "?1ezyfcl",
+        ],
+    )
+    def test_valid(self, bech):
+        hrp, data = bech32_decode(bech)
+        assert hrp is not None and data is not None
+        assert bech32_encode(hrp, data) == bech.lower()
+
+    @pytest.mark.parametrize(
+        "bech",
+        [
+            " 1nwldj5",
+            "\x7f1axkwrx",
+            "an84characterslonghumanreadablepartthatcontainsthenumber1andthe"
+            "excludedcharactersbio1569pvx",
+            "pzry9x0s0muk",
+            "1pzry9x0s0muk",
+            "x1b4n0q5v",
+            "li1dgmt3",
+            "de1lg7wt\xff",
+            "A1G7SGD8",
+            "10a06t8",
+            "1qzzfhee",
+            "a12UEL5L",
+        ],
+    )
+    def test_invalid(self, bech):
+        assert bech32_decode(bech) == (None, None)
+
+    @pytest.mark.parametrize("payment_request", payment_requests)
+    def test_long_strings(self, payment_request):
+        hrp, data = bech32_decode(payment_request)
+        assert hrp and data
+        assert len(payment_request) > 90
+        assert bech32_encode(hrp, data) == payment_request
+
+    def test_charset(self):
+        assert bech32_encode("a", range(32)).startswith("a1" + CHARSET)
@@ -0,0 +1,61 @@
+import time
+
+from bolt11 import decode_cache, decode_cached
+from bolt11.cache import CacheStats, LRUCache
+
+from .helpers import payment_requests
+
+
+class TestLRUCache:
+    def test_eviction(self):
+        cache: LRUCache[int] = LRUCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.get("a") == 1
+        cache.set("c", 3)
+        # `b` is the least recently used
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.stats == CacheStats(
+            hits=3, misses=1, evictions=1, size=2, maxsize=2
+        )
+
+    def test_expiry(self):
+        cache: LRUCache[int] = LRUCache()
+        cache.set("a", 1, expires_at=time.time() - 1)
+        cache.set("b", 2, expires_at=time.time() + 60)
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+        assert len(cache) == 1
+
+    def test_resize_and_clear(self):
+        cache: LRUCache[int] = LRUCache(maxsize=3)
+        for i in range(3):
+            cache.set(i, i)
+        cache.resize(1)
+        assert len(cache) == 1
+        assert cache.get(2) == 2
+        cache.clear()
+        assert cache.stats == CacheStats(
+            hits=0, misses=0, evictions=0, size=0, maxsize=1
+        )
+
+
+class TestDecodeCached:
+    def test_decode_cached(self):
+        decode_cache.clear()
+        pr = payment_requests[0]
+        decoded = decode_cached(pr, expire=False)
+        assert decode_cached(f" {pr.upper()}\n", expire=False) is decoded
+        assert decode_cached(pr, ignore_exceptions=True, expire=False) is not decoded
+        assert decode_cache.stats.hits == 1
+        assert decode_cache.stats.misses == 2
+        decode_cache.clear()
+
+    def test_expired_not_cached(self):
+        decode_cache.clear()
+        # spec examples expired long ago
+        decoded = decode_cached(payment_requests[0])
+        assert decoded.has_expired()
+        assert len(decode_cache) == 0
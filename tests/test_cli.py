@@ -0,0 +1,44 @@
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from bolt11 import decode
+from bolt11.cli import decode_batch
+
+from .helpers import payment_requests
+
+lines = [
+    *payment_requests,
+    "",
+    "lightning:" + payment_requests[0].upper(),
+    "lnbc1invalid",
+]
+
+
+class TestDecodeBatch:
+    @pytest.mark.parametrize("workers", ["1", "2"])
+    def test_decode_batch(self, workers):
+        result = CliRunner().invoke(
+            decode_batch,
+            ["--workers", workers, "--chunksize", "2", "--stats"],
+            input="\n".join(lines),
+        )
+        assert result.exit_code == 0
+        results = [json.loads(line) for line in result.stdout.splitlines()]
+        assert [r["line"] for r in results] == [1, 2, 3, 4, 5, 6, 8, 9]
+        for pr, r in zip(payment_requests, results):
+            assert r["invoice"] == decode(pr, ignore_exceptions=True).data
+        assert results[-2]["invoice"] == results[0]["invoice"]
+        assert results[-1]["type"] == "Bolt11Bech32InvalidException"
+        assert "decoded 8 invoices, 1 errors" in result.stderr
+
+    def test_strict(self, tmp_path):
+        path = tmp_path / "invoices.txt"
+        path.write_text("\n".join(payment_requests[:2]))
+        result = CliRunner().invoke(
+            decode_batch, [str(path), "-w", "1", "--no-ignore-exceptions", "--strict"]
+        )
+        results = [json.loads(line) for line in result.stdout.splitlines()]
+        assert [r["type"] for r in results] == ["Bolt11NoMinFinalCltvException"] * 2
+        assert not result.stderr
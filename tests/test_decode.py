@@ -0,0 +1,184 @@
+import pytest
+
+from bolt11 import Tag, TagChar, decode, encode, peek, quick_check
+from bolt11.bech32 import CHARSET, bech32_decode, bech32_encode
+from bolt11.decode import MAX_PAYMENT_REQUEST_LENGTH
+from bolt11.exceptions import (
+    Bolt11Bech32InvalidException,
+    Bolt11DataTruncatedException,
+    Bolt11HrpInvalidException,
+    Bolt11SignatureTooShortException,
+)
+from bolt11.models.tags import BytesTag, LazyTag
+
+from .helpers import payment_requests, sign_u5
+
+
+class TestDecodeEngine:
+    """
+    The default decoder works on the 5-bit groups directly,
+    it has to produce the same invoices as the `bitstring` decoder.
+    """
+
+    @pytest.mark.parametrize("payment_request", payment_requests)
+    def test_same_as_legacy(self, payment_request):
+        decoded = decode(payment_request)
+        legacy = decode(payment_request, legacy=True)
+        assert decoded.data == legacy.data
+        assert decoded.signature == legacy.signature
+        assert [tag.char for tag in decoded.tags] == [tag.char for tag in legacy.tags]
+        for tag, legacy_tag in zip(decoded.tags, legacy.tags):
+            if tag.char == TagChar.features:
+                assert tag.data.data == legacy_tag.data.data
+                assert tag.data.readable == legacy_tag.data.readable
+            else:
+                assert tag.data == legacy_tag.data
+
+    @pytest.mark.parametrize(
+        "tag", [TagChar.expire_time, TagChar.min_final_cltv_expiry]
+    )
+    def test_empty_int_field(self, tag):
+        hrp, data = bech32_decode(payment_requests[5])
+        assert hrp and data
+        payment_request = sign_u5(hrp, data[:-104] + [CHARSET.find(tag.value), 0, 0])
+        for legacy in (False, True):
+            with pytest.raises(ValueError, match="zero length"):
+                decode(payment_request, legacy=legacy)
+        if tag == TagChar.expire_time:
+            with pytest.raises(ValueError, match="zero length"):
+                peek(payment_request)
+
+    def test_empty_features(self):
+        hrp, data = bech32_decode(payment_requests[5])
+        assert hrp and data
+        payment_request = sign_u5(hrp, data[:-104] + [CHARSET.find("9"), 0, 0])
+        for legacy in (False, True):
+            features = decode(payment_request, legacy=legacy).features
+            assert features and features.data.len == 0 and not features.feature_list
+
+    def test_signature_too_short(self):
+        with pytest.raises(Bolt11SignatureTooShortException):
+            decode(bech32_encode("lnbc", [0] * 103))
+
+    def test_truncated_tagged_field(self):
+        hrp, data = bech32_decode(payment_requests[0])
+        assert hrp and data
+        # cut the last tagged field in half
+        truncated = bech32_encode(hrp, data[:100] + data[-104:])
+        with pytest.raises(Bolt11DataTruncatedException):
+            decode(truncated)
+
+
+class TestLazyDecode:
+    @pytest.mark.parametrize("payment_request", payment_requests)
+    def test_lazy(self, payment_request):
+        decoded = decode(payment_request, lazy=True)
+        lazy_tags = [tag for tag in decoded.tags if isinstance(tag, LazyTag)]
+        assert lazy_tags
+        assert all(tag._load is not None for tag in lazy_tags)
+        assert isinstance(decoded.tags.get(TagChar.payment_secret), BytesTag)
+        assert decoded.data == decode(payment_request).data
+        assert all(tag._load is None for tag in lazy_tags)
+
+
+class TestBytes:
+    @pytest.mark.parametrize("payment_request", payment_requests)
+    def test_bytes_accessors(self, payment_request):
+        decoded = decode(payment_request)
+        assert decoded.payment_hash_bytes.hex() == decoded.payment_hash
+        assert decoded.payee_bytes and decoded.payee_bytes.hex() == decoded.payee
+        for name in ("payment_secret", "description_hash", "metadata"):
+            value = getattr(decoded, f"{name}_bytes")
+            assert (value.hex() if value else None) == getattr(decoded, name)
+
+    def test_encode_bytes(self):
+        decoded = decode(payment_requests[1])
+        for char in (TagChar.payment_hash, TagChar.description_hash):
+            tag = decoded.tags.get(char)
+            assert tag
+            decoded.tags.tags[decoded.tags.tags.index(tag)] = Tag(char, tag.raw)
+        assert encode(decoded) == payment_requests[1]
+
+
+class TestSlots:
+    @pytest.mark.parametrize("lazy", [False, True])
+    def test_no_instance_dict(self, lazy):
+        decoded = decode(payment_requests[0], lazy=lazy)
+        for obj in (decoded, decoded.signature, decoded.tags, *decoded.tags):
+            assert not hasattr(obj, "__dict__")
+
+
+class TestDeferredVerification:
+    @pytest.mark.parametrize("payment_request", payment_requests)
+    def test_verify(self, payment_request):
+        decoded = decode(payment_request)
+        unverified = decode(payment_request, verify=False)
+        assert unverified.payment_hash == decoded.payment_hash
+        assert unverified.verify()
+        assert unverified.payee == decoded.payee
+
+    def test_payee_recovered_on_access(self):
+        # no `n` field, the payee is only known after recovery
+        unverified = decode(payment_requests[0], verify=False)
+        assert not unverified.tags.has(TagChar.payee)
+        assert unverified.payee == decode(payment_requests[0]).payee
+        assert unverified.tags.has(TagChar.payee)
+
+
+class TestPeek:
+    @pytest.mark.parametrize("payment_request", payment_requests)
+    def test_peek(self, payment_request):
+        header = peek(payment_request)
+        decoded = decode(payment_request)
+        assert header.currency == decoded.currency
+        assert header.amount_msat == decoded.amount_msat
+        assert header.date == decoded.date
+        assert header.expiry == decoded.expiry
+        assert header.expiry_time == decoded.expiry_time
+        assert header.payment_hash == decoded.payment_hash
+
+    def test_peek_invalid(self):
+        with pytest.raises(Bolt11Bech32InvalidException):
+            peek(payment_requests[0][:-1])
+
+
+class TestQuickCheck:
+    @pytest.mark.parametrize("payment_request", payment_requests)
+    def test_valid(self, payment_request):
+        assert quick_check(payment_request)
+        assert quick_check(payment_request.upper())
+
+    @pytest.mark.parametrize(
+        "payment_request, exception",
+        [
+            # the exception of a full decode, a failed checksum comes first
+            ("", Bolt11Bech32InvalidException),
+            ("hello world", Bolt11Bech32InvalidException),
+            ("bc1qw508d6qejxtdg4y5r3zarvary0c5xw7kv8f3t4", Bolt11HrpInvalidException),
+            ("lnbc", Bolt11Bech32InvalidException),
+            ("ln1" + "q" * 200, Bolt11Bech32InvalidException),
+            (bech32_encode("ln", [0] * 200), Bolt11HrpInvalidException),
+            ("lnbc1" + "q" * 100 + "b", Bolt11Bech32InvalidException),
+            ("lnbc1" + "q" * 109, Bolt11Bech32InvalidException),
+            (bech32_encode("lnbc", [0] * 103), Bolt11SignatureTooShortException),
+        ],
+    )
+    def test_invalid(self, payment_request, exception):
+        assert not quick_check(payment_request)
+        for legacy in (False, True):
+            with pytest.raises(exception):
+                decode(payment_request, legacy=legacy)
+
+    def test_max_length(self):
+        hrp, data = bech32_decode(payment_requests[0])
+        assert hrp and data
+        # unknown `v` fields of 1023 5-bit groups, longer than lnd accepts
+        padding = [CHARSET.find("v"), 31, 31] + [0] * 1023
+        payment_request = sign_u5(hrp, data[:-104] + padding * 7)
+        assert len(payment_request) > MAX_PAYMENT_REQUEST_LENGTH
+        assert quick_check(payment_request)
+        assert not quick_check(payment_request, max_length=MAX_PAYMENT_REQUEST_LENGTH)
+        assert (
+            decode(payment_request).payment_hash
+            == decode(payment_requests[0]).payment_hash
+        )
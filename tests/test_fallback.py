@@ -0,0 +1,68 @@
+import pickle
+
+import pytest
+from bitstring import Bits
+
+from bolt11 import Bolt11, Fallback, TagChar, decode
+from bolt11.bech32 import bech32_decode
+from bolt11.models.fallback import address_cache
+
+from .helpers import payment_requests, sign_u5
+
+addresses = [
+    ("mk2QpYatsKicvFVuTAQLBryyccRXMUaGHP", "tb"),
+    ("1RustyRX2oai4EYYDpQGWvEL62BBGqN9T", "bc"),
+    ("3EktnHQD7RiAE6uzMj2ZifT9YgRrkSgzQX", "bc"),
+    ("bc1qw508d6qejxtdg4y5r3zarvary0c5xw7kv8f3t4", "bc"),
+    ("bc1qrp33g0q5c5txsp9arysrx4k6zdkfs4nce4xj0gdcccefvpysxf3qccfmv3", "bc"),
+]
+
+
+class TestFallback:
+    @pytest.mark.parametrize("address, currency", addresses)
+    def test_from_address(self, address, currency):
+        address_cache.clear()
+        fallback = Fallback.from_address(address, currency)
+        assert fallback.address == address
+        assert Fallback.from_address(address, currency) is fallback
+        assert address_cache.stats.hits == 1
+        assert Fallback(fallback.data, currency) == fallback
+        assert Fallback.from_bitstring(fallback.data, currency) == fallback
+        assert Fallback.from_u5(fallback.raw, currency) == fallback
+        assert pickle.loads(pickle.dumps(fallback)) == fallback
+        assert hash(Fallback(fallback.data, currency)) == hash(fallback)
+        assert len({fallback, Fallback(fallback.data, currency)}) == 1
+
+    def test_read_only(self):
+        fallback = Fallback.from_address(*addresses[1])
+        with pytest.raises(AttributeError):
+            fallback.currency = "tb"  # type: ignore[misc]
+        assert Fallback.from_address(*addresses[1]).currency == "bc"
+
+    def test_address_on_access(self):
+        decoded = decode(payment_requests[1])
+        assert decoded.fallback
+        assert decoded.fallback._address is None
+        address = decoded.fallback.address
+        assert (
+            decoded.fallback._address == address == "mk2QpYatsKicvFVuTAQLBryyccRXMUaGHP"
+        )
+
+    def test_ignored_version(self):
+        assert (
+            Fallback.from_bitstring(Bits(uint=19, length=5) + Bits(160), "bc") is None
+        )
+
+    def test_empty(self):
+        assert Fallback.from_bitstring(Bits(), "bc") is None
+        hrp, data = bech32_decode(payment_requests[0])
+        assert hrp and data
+        # an `f` field without data, appended before the signature
+        payment_request = sign_u5(hrp, data[:-104] + [9, 0, 0])
+        for legacy in (False, True):
+            decoded = decode(payment_request, legacy=legacy)
+            assert decoded.tags.has(TagChar.fallback)
+            assert decoded.fallback is None
+            assert "fallback" not in decoded.data
+        assert decoded.payee == decode(payment_requests[0]).payee
+        assert Bolt11.from_bytes(decoded.to_bytes()).data == decoded.data
@@ -1,3 +1,4 @@
+import pickle
 from datetime import datetime, timezone
 
 import pytest
@@ -145,3 +146,53 @@ class TestDecodeFeatures:
         decoded = decode(encoded)
         assert decoded.features
         assert decoded.features.data.bin == features.data.bin
+
+
+class TestFeaturesMask:
+    def test_mask(self):
+        features = Features.from_bitstring(Bits(hex="02000002024100"))
+        assert features.mask == features.data.uint
+        assert features.has_feature("option_static_remotekey") == "required"
+        assert features.has_feature("option_anchor_outputs") == "supported"
+        assert features.has_feature("extra_26") == "supported"
+        assert features.has_feature("basic_mpp") is None
+        assert features.has_feature("extra_3") is None
+        assert features.has_feature("unknown") is None
+        new_features = Features.from_feature_list(features.feature_list)
+        assert new_features.mask == features.mask
+        assert new_features.data.uint == features.data.uint
+
+    def test_without_mask(self):
+        parsed = Features.from_bitstring(Bits(hex="02000002024100"))
+        features = Features(parsed.data, parsed.feature_list)
+        assert features.mask == 0
+        assert features.has_feature("option_static_remotekey") == "required"
+        assert features.has_feature("option_anchor_outputs") == "supported"
+        assert features.has_feature("extra_26") == "supported"
+        assert features.has_feature("basic_mpp") is None
+
+    def test_maximal_field(self):
+        bits = 1023 * 5
+        features = Features.from_bitstring(Bits(uint=(1 << bits) - 1, length=bits))
+        assert len(features.readable) == bits // 2 + 1
+        assert features.has_feature("option_zeroconf") == "supported"
+        assert features.has_feature(f"extra_{bits // 2}") == "required"
+
+
+class TestFeatureExtra:
+    def test_interned(self):
+        assert FeatureExtra(30) is FeatureExtra(30)
+        assert FeatureExtra(30).name == "extra_30"
+        assert pickle.loads(pickle.dumps(FeatureExtra(30))) is FeatureExtra(30)
+        features = Features.from_bitstring(Bits(hex="02000002024100"))
+        assert FeatureExtra(26) in features.feature_list
+
+    def test_from_dict(self):
+        readable = {"payment_secret": "required", "extra_30": "supported"}
+        features = Features.from_dict(readable)
+        assert features.readable == readable
+        assert features.feature_list[FeatureExtra(30)] == FeatureState.supported
+        with pytest.raises(ValueError):
+            Features.from_dict({"payment_secret": "optional"})
+        with pytest.raises(ValueError):
+            Features.from_dict({"unknown": "required"})
@@ -1,4 +1,8 @@
-from bolt11 import Bolt11, RouteHint, Tag, TagChar, Tags, decode, encode
+import pickle
+
+import pytest
+
+from bolt11 import Bolt11, Route, RouteHint, Tag, TagChar, Tags, decode, encode
 
 from .helpers import check_decoded_routes
 
@@ -120,3 +124,48 @@ class TestRouteHintsSize:
         )
 
         assert hints.data
+
+
+class TestRouteHintPacked:
+    def route(self, index, fee=1):
+        return Route(
+            public_key=ex["route_hints"][0][0]["public_key"],
+            short_channel_id=f"{index}x{index}x{index}",
+            base_fee=fee,
+            ppm_fee=fee,
+            cltv_expiry_delta=index,
+        )
+
+    @pytest.mark.parametrize("hops", [1, 4, 5, 10])
+    def test_round_trip(self, hops):
+        routes = [self.route(i, fee=2**32 - 1) for i in range(hops)]
+        route_hint = RouteHint(routes)
+        assert len(route_hint) == hops
+        assert route_hint.routes == tuple(routes)
+        assert len(route_hint.raw) == 51 * hops
+        invoice = decode(ex["payment_request"])
+        invoice.tags.add(TagChar.route_hint, route_hint)
+        decoded = decode(encode(invoice, ex["private_key"]))
+        assert decoded.route_hints
+        assert decoded.route_hints[-1] == route_hint
+        assert decoded.route_hints[-1].routes == tuple(routes)
+
+    def test_compat(self):
+        route_hint = RouteHint.from_list(ex["route_hints"][0])
+        assert route_hint == RouteHint(routes=list(route_hint))
+        assert pickle.loads(pickle.dumps(route_hint)) == route_hint
+        assert RouteHint.from_bitstring(route_hint.data) == route_hint
+        assert RouteHint.from_bytes(route_hint.raw + b"\x00" * 50) == route_hint
+        assert hash(RouteHint(routes=list(route_hint))) == hash(route_hint)
+        assert len({route_hint, RouteHint.from_bytes(route_hint.raw)}) == 1
+
+    def test_read_only(self):
+        route_hint = RouteHint.from_list(ex["route_hints"][0])
+        with pytest.raises(AttributeError):
+            route_hint.routes.append(route_hint.routes[0])  # type: ignore[attr-defined]
+        assert RouteHint(route_hint.routes) == route_hint
+        assert not RouteHint()
+
+    def test_invalid_public_key(self):
+        with pytest.raises(ValueError):
+            RouteHint([self.route(1)._replace(public_key="02")])
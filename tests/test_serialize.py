@@ -0,0 +1,189 @@
+import json
+import pickle
+
+import pytest
+from bitstring import Bits
+
+from bolt11 import (
+    Bolt11,
+    Feature,
+    Features,
+    FeatureState,
+    MilliSatoshi,
+    RouteHint,
+    Tag,
+    TagChar,
+    Tags,
+    decode,
+    encode,
+    set_json_backend,
+)
+from bolt11.models.fallback import Fallback
+from bolt11.types import BINARY_VERSION
+
+from .helpers import payment_requests
+
+private_key = "e126f68f7eafcc8b74f54d269fe206be715000f94dac067d1c04a8ca3b2db734"
+
+
+@pytest.fixture(autouse=True)
+def reset_backend():
+    yield
+    set_json_backend()
+
+
+class TestCachedData:
+    def test_cached(self):
+        decoded = decode(payment_requests[1])
+        data = decoded.data
+        assert decoded.data == data
+        data["amount_msat"] = 0
+        assert decoded.data["amount_msat"] != 0
+        assert decoded.json is decoded.json
+        assert json.loads(decoded.json) == decoded.data
+
+    def test_nested_copy(self):
+        decoded = decode(payment_requests[2])
+        data = decoded.data
+        data["route_hints"][0][0]["base_fee"] = 999999
+        data["route_hints"][0].clear()
+        data["features"]["extra_100"] = "required"
+        assert decoded.data["route_hints"][0][0]["base_fee"] == 1
+        assert "extra_100" not in decoded.data["features"]
+        assert json.loads(decoded.json) == decode(payment_requests[2]).data
+
+    def test_field_assignment(self):
+        decoded = decode(payment_requests[0])
+        decoded.json
+        decoded.amount_msat = MilliSatoshi(1234)
+        assert decoded.data["amount_msat"] == 1234
+        assert json.loads(decoded.json)["amount_msat"] == 1234
+
+    def test_tags_changed(self):
+        decoded = decode(payment_requests[0])
+        decoded.data
+        decoded.tags.add(TagChar.metadata, "abcd")
+        assert decoded.data["metadata"] == "abcd"
+        decoded.tags.tags = [
+            tag for tag in decoded.tags if tag.char != TagChar.description
+        ]
+        assert "description" not in decoded.data
+        decoded.tags.tags.pop()
+        assert "metadata" not in decoded.json
+        decoded.tags.tags[0] = Tag(TagChar.description, "replaced")
+        assert decoded.description == "replaced"
+        assert decoded.data["description"] == "replaced"
+
+    def test_payee_recovered(self):
+        # building the data recovers the payee, adding an `n` tag
+        unverified = decode(payment_requests[0], verify=False)
+        payee = decode(payment_requests[0]).payee
+        assert unverified.data["payee"] == payee
+        assert unverified.tags.has(TagChar.payee)
+        assert unverified.data["payee"] == payee
+
+    def test_pickle(self):
+        set_json_backend(lambda obj: json.dumps(obj, indent=1))
+        decoded = decode(payment_requests[0])
+        decoded.json
+        loaded = pickle.loads(pickle.dumps(decoded))
+        assert loaded.data == decoded.data
+
+
+class TestJsonBackend:
+    def test_callable(self):
+        decoded = decode(payment_requests[0])
+        default = decoded.json
+        set_json_backend(lambda obj: json.dumps(obj, separators=(",", ":")))
+        assert decoded.json != default
+        assert json.loads(decoded.json) == json.loads(default)
+        set_json_backend()
+        assert decoded.json == default
+
+    def test_orjson(self):
+        pytest.importorskip("orjson")
+        decoded = decode(payment_requests[1])
+        set_json_backend("orjson")
+        assert json.loads(decoded.json) == decoded.data
+        assert ", " not in decoded.json
+
+    def test_unknown(self):
+        with pytest.raises(ValueError):
+            set_json_backend("simdjson")
+
+
+def tag_data(invoice):
+    return [(tag.char, tag.data) for tag in invoice.tags]
+
+
+class TestBinary:
+    @pytest.mark.parametrize("payment_request", payment_requests)
+    @pytest.mark.parametrize("verify", [True, False])
+    def test_roundtrip(self, payment_request, verify):
+        decoded = decode(payment_request, verify=verify)
+        data = decoded.to_bytes()
+        loaded = Bolt11.from_bytes(data)
+        assert loaded.to_bytes() == data
+        assert loaded._unverified is not verify
+        assert loaded.signature == decoded.signature
+        assert loaded.amount_msat == decoded.amount_msat
+        assert tag_data(loaded) == tag_data(decoded)
+        assert loaded.data == decoded.data
+
+    def test_unsigned(self):
+        invoice = Bolt11(
+            currency="bc",
+            date=1496314658,
+            tags=Tags(
+                [
+                    Tag(TagChar.payment_hash, "00" * 32),
+                    Tag(TagChar.description, "caf\u00e9"),
+                    Tag(TagChar.expire_time, 0),
+                    Tag(TagChar.min_final_cltv_expiry, 1 << 40),
+                    Tag(
+                        TagChar.fallback,
+                        Fallback.from_address(
+                            "1RustyRX2oai4EYYDpQGWvEL62BBGqN9T", "bc"
+                        ),
+                    ),
+                    Tag(TagChar.fallback, None),
+                    Tag(TagChar.route_hint, RouteHint([])),
+                    Tag(
+                        TagChar.features,
+                        Features.from_feature_list(
+                            {Feature.payment_secret: FeatureState.supported}
+                        ),
+                    ),
+                    Tag(TagChar.features, Features.from_bitstring(Bits())),
+                ]
+            ),
+        )
+        loaded = Bolt11.from_bytes(invoice.to_bytes())
+        assert loaded.signature is None
+        assert loaded.amount_msat is None
+        assert tag_data(loaded) == tag_data(invoice)
+        invoice.amount_msat = MilliSatoshi(0)
+        assert Bolt11.from_bytes(invoice.to_bytes()).amount_msat == 0
+
+    def test_large_amount(self):
+        invoice = decode(payment_requests[0])
+        invoice.amount_msat = MilliSatoshi(2**64 * 10)
+        decoded = decode(encode(invoice, private_key))
+        assert decoded.amount_msat == 2**64 * 10
+        loaded = Bolt11.from_bytes(decoded.to_bytes())
+        assert loaded.amount_msat == decoded.amount_msat
+        assert loaded.to_bytes() == decoded.to_bytes()
+
+    def test_does_not_fit(self):
+        invoice = decode(payment_requests[0])
+        invoice.date = -1
+        with pytest.raises(ValueError, match="binary format"):
+            invoice.to_bytes()
+
+    def test_invalid(self):
+        data = decode(payment_requests[0]).to_bytes()
+        with pytest.raises(ValueError, match="version"):
+            Bolt11.from_bytes(bytes([BINARY_VERSION + 1]) + data[1:])
+        for end in (10, 40, len(data) - 1):
+            with pytest.raises(ValueError):
+                Bolt11.from_bytes(data[:end])
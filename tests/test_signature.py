@@ -1,4 +1,5 @@
 from bolt11 import Signature
+from bolt11.models.signature import recovery_cache
 
 ex = {
     "private_key": "e126f68f7eafcc8b74f54d269fe206be715000f94dac067d1c04a8ca3b2db734",
@@ -21,3 +22,21 @@ class TestBolt11Signature:
             signature_data=signature.signature_data,
         )
         assert signature.verify(ex["public_key"])
+
+    def test_recovery_cache(self):
+        recovery_cache.clear()
+        signature = Signature.from_private_key(
+            hrp="lnbc1",
+            private_key=ex["private_key"],
+            signing_data=b"1234567890",
+        )
+        assert signature.recover_public_key() == ex["public_key"]
+        assert recovery_cache.stats.misses == 1
+        assert signature.recover_public_key() == ex["public_key"]
+        assert recovery_cache.stats.hits == 1
+
+        # same signature over another message
+        signature.signing_data = b"0987654321"
+        assert signature.recover_public_key() != ex["public_key"]
+        assert recovery_cache.stats.misses == 2
+        recovery_cache.clear()
@@ -0,0 +1,71 @@
+import pickle
+
+from bolt11 import RouteHint, Tag, TagChar, Tags
+from bolt11.models.tags import BytesTag, TagList
+
+
+class TestTags:
+    def test_get_first(self):
+        tags = Tags([Tag(TagChar.description, "first")])
+        tags.add(TagChar.description, "second")
+        assert tags.has(TagChar.description)
+        assert not tags.has(TagChar.payment_hash)
+        tag = tags.get(TagChar.description)
+        assert tag and tag.data == "first"
+        assert tags.get(TagChar.payment_hash) is None
+        assert [tag.data for tag in tags] == ["first", "second"]
+
+    def test_route_hints(self):
+        hints = [RouteHint([]) for _ in range(300)]
+        tags = Tags([Tag(TagChar.route_hint, hint) for hint in hints[:100]])
+        tags.add(TagChar.payment_hash, "00" * 32)
+        for hint in hints[100:]:
+            tags.add(TagChar.route_hint, hint)
+        assert tags.get_route_hints() == hints
+        tag = tags.get(TagChar.route_hint)
+        assert tag and tag.data is hints[0]
+
+    def test_list_changed_directly(self):
+        tags = Tags()
+        tags.tags.append(Tag(TagChar.description, "appended"))
+        tag = tags.get(TagChar.description)
+        assert tag and tag.data == "appended"
+        tags.tags = [Tag(TagChar.payment_hash, "00" * 32)]
+        assert not tags.has(TagChar.description)
+        assert tags.has(TagChar.payment_hash)
+
+    def test_list_changed_in_place(self):
+        tags = Tags([Tag(TagChar.description, "first"), Tag(TagChar.expire_time, 60)])
+        version = tags.version
+        tags.tags[0] = Tag(TagChar.description, "replaced")
+        tag = tags.get(TagChar.description)
+        assert tag and tag.data == "replaced"
+        assert tags.version != version
+        tags.tags.pop()
+        tags.tags.append(Tag(TagChar.payment_hash, "00" * 32))
+        assert not tags.has(TagChar.expire_time)
+        assert tags.has(TagChar.payment_hash)
+        tags.tags.reverse()
+        del tags.tags[0]
+        assert not tags.has(TagChar.payment_hash)
+        tags.tags += [Tag(TagChar.min_final_cltv_expiry, 18)]
+        assert tags.has(TagChar.min_final_cltv_expiry)
+
+    def test_list_copied(self):
+        original = [Tag(TagChar.description, "first")]
+        tags = Tags(original)
+        original.append(Tag(TagChar.expire_time, 60))
+        assert len(tags.tags) == 1
+        assert not tags.has(TagChar.expire_time)
+        loaded = pickle.loads(pickle.dumps(tags))
+        assert isinstance(loaded.tags, TagList)
+        assert loaded.get(TagChar.description)
+
+    def test_bytes_tag(self):
+        tag = BytesTag(TagChar.payment_hash, "00ff" * 16)
+        assert tag.raw == bytes.fromhex("00ff" * 16)
+        assert tag.data == "00ff" * 16
+        tag.data = b"\x01" * 32
+        assert tag.data == "01" * 32
+        assert Tag(TagChar.payment_hash, "01" * 32).raw == tag.raw
+        assert Tag(TagChar.payment_hash, b"\x01" * 32).raw == tag.raw
@@ -1,11 +1,72 @@
 from decimal import Decimal
+from re import fullmatch, match
 
 import pytest
+from hypothesis import given
+from hypothesis import strategies as st
 
 from bolt11.bit_utils import int_to_scid, scid_to_int
 from bolt11.compat import shorten_amount, unshorten_amount
-from bolt11.exceptions import Bolt11AmountInvalidException
-from bolt11.utils import amount_to_btc, amount_to_sat, btc_to_amount, sat_to_amount
+from bolt11.exceptions import Bolt11AmountInvalidException, Bolt11HrpInvalidException
+from bolt11.types import MilliSatoshi
+from bolt11.utils import (
+    amount_to_btc,
+    amount_to_msat,
+    amount_to_sat,
+    btc_to_amount,
+    msat_to_amount,
+    sat_to_amount,
+    verify_hrp,
+)
+
+
+# previous regex and Decimal based implementations
+def ref_verify_hrp(hrp):
+    matches = match(r"ln(bcrt|bc|tbs|tb)(\w+)?", hrp)
+    if matches is None:
+        raise Bolt11HrpInvalidException()
+    currency, amount_str = matches.groups()
+    return currency, ref_amount_to_msat(amount_str) if amount_str else None
+
+
+def ref_amount_to_msat(amount):
+    if not fullmatch(r"\d+[pnum]?", amount):
+        raise Bolt11AmountInvalidException()
+    try:
+        num = {"p": 10**12, "n": 10**9, "u": 10**6, "m": 10**3}[amount[-1]]
+        return MilliSatoshi(Decimal(amount[:-1]) / num * 100_000_000_000)
+    except KeyError:
+        return MilliSatoshi(Decimal(amount) * 100_000_000_000)
+
+
+def ref_msat_to_amount(msat):
+    value = msat * 10
+    unit = ""
+    for unit in ["p", "n", "u", "m", ""]:
+        if value % 1000 == 0:
+            value //= 1000
+        else:
+            break
+    return f"{value}{unit}"
+
+
+def ref_btc_to_amount(btc):
+    return ref_msat_to_amount(MilliSatoshi(Decimal(btc) * 100_000_000_000))
+
+
+def result(func, *args):
+    try:
+        return func(*args)
+    except Exception as exc:
+        return type(exc)
+
+
+# amounts within the 28 digit precision of Decimal, which the references use
+digits = st.integers(min_value=0, max_value=10**20).map(str)
+amounts = st.one_of(
+    st.tuples(digits, st.sampled_from(["", "p", "n", "u", "m"])).map("".join),
+    st.text(alphabet="0123456789pnumx_-.٣²", max_size=12),
+)
 
 
 class TestScid:
@@ -65,3 +126,42 @@ class TestAmounts:
     def test_invalid_amount(self, amount):
         with pytest.raises(Bolt11AmountInvalidException):
             amount_to_btc(amount)
+
+
+class TestAmountsEquivalence:
+    @given(amounts)
+    def test_amount_to_msat(self, amount):
+        assert result(amount_to_msat, amount) == result(ref_amount_to_msat, amount)
+
+    @given(
+        st.sampled_from(["ln", "lnbc", "lnbcrt", "lntb", "lntbs", "lnsb", "xxbc"]),
+        st.one_of(amounts, st.text(max_size=8)),
+    )
+    def test_verify_hrp(self, prefix, amount):
+        hrp = prefix + amount
+        assert result(verify_hrp, hrp) == result(ref_verify_hrp, hrp)
+
+    # the reference shortens exact multiples of 1000 btc by one unit too many
+    @given(
+        st.integers(min_value=-(10**20), max_value=10**20).filter(
+            lambda msat: msat == 0 or msat % 10**14
+        )
+    )
+    def test_msat_to_amount(self, msat):
+        assert msat_to_amount(msat) == ref_msat_to_amount(msat)
+        assert amount_to_msat(msat_to_amount(abs(msat))) == abs(msat)
+
+    # whole thousands of btc once truncated to msat, as above
+    @given(
+        st.decimals(min_value=0, max_value=10**6, places=12).filter(
+            lambda btc: MilliSatoshi.from_btc(btc) % 10**14
+            or not MilliSatoshi.from_btc(btc)
+        )
+    )
+    def test_btc_to_amount(self, btc):
+        assert btc_to_amount(btc) == ref_btc_to_amount(btc)
+
+    @pytest.mark.parametrize("btc, amount", [(1000, "1000"), (10**6, "1000000")])
+    def test_whole_thousands_of_btc(self, btc, amount):
+        assert btc_to_amount(btc) == amount
+        assert amount_to_btc(amount) == btc
@@ -0,0 +1,204 @@
+import pytest
+
+from bolt11 import Tag, TagChar, decode, decode_many, encode
+from bolt11.bech32 import CHARSET, bech32_decode, bech32_encode
+from bolt11.bit_utils import u5_to_bytes
+from bolt11.decode import _scan_tagged
+from bolt11.exceptions import (
+    Bolt11Bech32InvalidException,
+    Bolt11NoMinFinalCltvException,
+    Bolt11NoPaymentHashException,
+    Bolt11SignatureTooShortException,
+)
+
+from .helpers import payment_requests, sign_u5
+
+np = pytest.importorskip("numpy")
+vectorized = pytest.importorskip("bolt11.vectorized")
+
+private_key = "e126f68f7eafcc8b74f54d269fe206be715000f94dac067d1c04a8ca3b2db734"
+
+invalid = [
+    "",
+    "not an invoice",
+    bech32_encode("lnbc", [0] * 103),
+    payment_requests[0][:-1] + "x",
+    payment_requests[0].replace("lnbc", "lnxx"),
+    "lnbc1" + "é" * 200,
+]
+
+
+class TestVectorized:
+    def test_decode_bulk(self):
+        prs = [*payment_requests, payment_requests[1].upper(), *invalid]
+        results = vectorized.decode_bulk(prs, chunksize=3)
+        expected = decode_many(prs, workers=1)
+        assert len(results) == len(prs)
+        for result, other in zip(results, expected):
+            if isinstance(other, Exception):
+                assert type(result) is type(other)
+            else:
+                assert not isinstance(result, Exception)
+                assert result.data == other.data
+                assert result.signature == other.signature
+
+    def test_decode_bulk_errors(self):
+        results = vectorized.decode_bulk(invalid)
+        assert [type(result) for result in results] == [
+            Bolt11Bech32InvalidException,
+            Bolt11Bech32InvalidException,
+            Bolt11SignatureTooShortException,
+            Bolt11Bech32InvalidException,
+            Bolt11Bech32InvalidException,
+            Bolt11Bech32InvalidException,
+        ]
+
+    def test_decode_bulk_flags(self):
+        results = vectorized.decode_bulk(payment_requests[:2], strict=True)
+        assert all(
+            isinstance(result, Bolt11NoMinFinalCltvException) for result in results
+        )
+        results = vectorized.decode_bulk(payment_requests, verify=False)
+        assert all(result._unverified for result in results)
+        assert results[0].payee == decode_many(payment_requests[:1])[0].payee
+
+    def test_verify_checksums(self):
+        valid = vectorized.verify_checksums([*payment_requests, *invalid])
+        assert valid.tolist() == [True] * len(payment_requests) + [
+            False,
+            False,
+            True,
+            False,
+            False,
+            False,
+        ]
+
+    def test_mixed_lengths(self):
+        hrp, data = bech32_decode(payment_requests[0])
+        assert hrp and data
+        # unknown `v` fields, many times the length of the others
+        padding = [CHARSET.find("v"), 31, 31] + [0] * 1023
+        long = sign_u5(hrp, data[:-104] + padding * 7)
+        prs = [*payment_requests[:3], long, *payment_requests[3:]]
+        assert [3] in vectorized._by_length(prs)
+        expected = [decode(pr).payment_hash for pr in prs]
+        results = vectorized.decode_bulk(prs)
+        assert [result.payment_hash for result in results] == expected
+        columns = vectorized.decode_to_columns(prs)
+        assert [row.tobytes().hex() for row in columns["payment_hash"]] == expected
+        assert vectorized.verify_checksums(prs).all()
+
+    def test_unpack_u5(self):
+        rows = [[31, 0, 17, 5, 30, 2, 9], [1, 2, 3, 4, 5, 6, 7]]
+        unpacked = vectorized.unpack_u5(np.array(rows, dtype=np.uint8))
+        for row, data in zip(rows, unpacked):
+            assert data.tobytes() == u5_to_bytes(row, pad=True)
+
+
+def with_descriptions(*tags):
+    """Sign the first test invoice again with `tags` in place of its `d`."""
+    invoice = decode(payment_requests[0])
+    invoice.tags.tags = [
+        tag for tag in invoice.tags if tag.char != TagChar.description
+    ] + list(tags)
+    return encode(invoice, private_key, ignore_exceptions=True)
+
+
+def metadata_as_description(pr):
+    """Turn the `m` field into a `d`, the signature no longer matches."""
+    hrp, data = bech32_decode(pr)
+    assert hrp and data
+    for tag, start, _ in _scan_tagged(data):
+        if tag == TagChar.metadata:
+            data[start - 3] = CHARSET.find(TagChar.description.value)
+    return bech32_encode(hrp, data)
+
+
+class TestColumns:
+    @pytest.mark.parametrize("verify", [True, False])
+    def test_decode_to_columns(self, verify):
+        prs = [*payment_requests, *invalid]
+        columns = vectorized.decode_to_columns(prs, verify=verify, chunksize=4)
+        expected = vectorized.decode_bulk(prs, verify=verify)
+        assert all(len(column) == len(prs) for column in columns.values())
+        for i, other in enumerate(expected):
+            error = vectorized.COLUMN_ERRORS[columns["error"][i]]
+            if isinstance(other, Exception):
+                assert error is type(other)
+                assert columns["currency"][i] == -1
+                continue
+            assert error is None
+            assert columns["amount_msat"][i] == (other.amount_msat or 0)
+            assert columns["date"][i] == other.date
+            assert columns["expiry"][i] == other.expiry
+            assert columns["min_final_cltv_expiry"][i] == other.min_final_cltv_expiry
+            assert vectorized.CURRENCIES[columns["currency"][i]] == other.currency
+            assert columns["payment_hash"][i].tobytes() == other.payment_hash_bytes
+            payee = other.tags.get(TagChar.payee)
+            if payee:
+                assert columns["payee"][i].tobytes() == payee.raw
+            else:
+                assert not columns["payee"][i].any()
+
+    def test_validation(self):
+        columns = vectorized.decode_to_columns(payment_requests[:2], strict=True)
+        assert (
+            columns["error"].tolist()
+            == [vectorized.COLUMN_ERRORS.index(Bolt11NoMinFinalCltvException)] * 2
+        )
+        assert not columns["amount_msat"].any()
+        invoice = decode(payment_requests[0])
+        invoice.tags.tags = [
+            tag for tag in invoice.tags if tag.char != TagChar.payment_hash
+        ]
+        pr = encode(invoice, private_key, ignore_exceptions=True)
+        codes = vectorized.decode_to_columns([pr])["error"]
+        assert vectorized.COLUMN_ERRORS[codes[0]] is Bolt11NoPaymentHashException
+        columns = vectorized.decode_to_columns([pr], ignore_exceptions=True)
+        assert columns["error"][0] == 0
+        assert not columns["payment_hash"].any()
+
+    def test_empty(self):
+        columns = vectorized.decode_to_columns([])
+        assert columns["payee"].shape == (0, 33)
+        assert columns["error"].shape == (0,)
+
+    def test_overflow(self):
+        hrp, data = bech32_decode(payment_requests[5])
+        assert hrp and data
+        # an expiry of 2**64 in 13 5-bit groups and an amount of 10**20 msat
+        expiry = [CHARSET.find("x"), 0, 13, 16] + [0] * 12
+        prs = [
+            sign_u5(hrp, data[:-104] + expiry),
+            sign_u5("lnbc1000000000", data[:-104]),
+        ]
+        assert decode(prs[0]).expiry == 2**64
+        assert decode(prs[1]).amount_msat == 10**20
+        columns = vectorized.decode_to_columns(prs)
+        code = vectorized.COLUMN_ERRORS.index(OverflowError)
+        assert columns["error"].tolist() == [code, code]
+        assert not columns["expiry"].any() and not columns["amount_msat"].any()
+
+    def test_malformed_descriptions(self):
+        short_hash = Tag(TagChar.description_hash, "00" * 6)
+        description = Tag(TagChar.description, "description")
+        description_hash = Tag(TagChar.description_hash, "00" * 32)
+        prs = [
+            with_descriptions(short_hash),
+            with_descriptions(short_hash, description),
+            with_descriptions(description, description_hash),
+            with_descriptions(description_hash, short_hash),
+            metadata_as_description(with_descriptions(Tag(TagChar.metadata, "ff"))),
+            metadata_as_description(
+                with_descriptions(description, Tag(TagChar.metadata, "ff"))
+            ),
+        ]
+        for verify in (True, False):
+            columns = vectorized.decode_to_columns(prs, verify=verify)
+            for pr, code in zip(prs, columns["error"]):
+                try:
+                    decode(pr, verify=verify)
+                    expected = None
+                except Exception as exc:
+                    expected = type(exc)
+                assert vectorized.COLUMN_ERRORS[code] is expected